@@ -3,18 +3,45 @@ Flask API for Shopify SEO Tool.
 """
 
 import os
+import json
+import time
 import uuid
-from flask import Flask, request, jsonify, send_file, render_template
+import threading
+from flask import Flask, Request, Response, request, jsonify, send_file, render_template, stream_with_context
 from werkzeug.utils import secure_filename
 from werkzeug.exceptions import RequestEntityTooLarge
 
 from shopify_seo import ShopifySEOProcessor, Config
+from shopify_seo.compression import SUFFIXES, compression_for_path
+from shopify_seo.jobs import JobManager, QueueFullError, DONE, FAILED
+from shopify_seo.job_store import create_job_store
+from shopify_seo.janitor import TempJanitor
+from shopify_seo.upload import UploadSink, UploadRejected
 
 
-app = Flask(__name__)
-
 # Configuration
 config = Config.from_env()
+
+
+class StreamingRequest(Request):
+    """Request that streams file uploads into an UploadSink as they arrive."""
+    
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if not filename:
+            return super()._get_file_stream(total_content_length, content_type, filename, content_length)
+        # Reject before reading the body rather than after
+        if not filename.lower().endswith(config.allowed_extensions):
+            raise UploadRejected('Only CSV files (optionally .gz or .zst compressed) are allowed')
+        return UploadSink(
+            config.temp_dir,
+            secure_filename(filename) or 'upload.csv',
+            config.max_title_length,
+            config.upload_spool_size
+        )
+
+
+app = Flask(__name__)
+app.request_class = StreamingRequest
 app.config['MAX_CONTENT_LENGTH'] = config.max_file_size
 app.config['UPLOAD_FOLDER'] = config.temp_dir
 
@@ -24,19 +51,85 @@ os.makedirs(config.temp_dir, exist_ok=True)
 # Initialize processor
 processor = ShopifySEOProcessor(config)
 
-# In-memory storage for processing results (in production, use Redis or database)
-processing_results = {}
+# Preload the model in the background so the first upload does not pay for it
+if config.warm_up:
+    threading.Thread(target=processor.warm_up, daemon=True).start()
+
+# Background workers sharing the processor; uploads return as soon as they are queued.
+# Finished jobs (and their output files) expire from the store after job_ttl
+jobs = JobManager(
+    processor,
+    workers=config.job_workers,
+    queue_size=config.job_queue_size,
+    store=create_job_store(config)
+)
+
+# Keep temp_dir within its age and size limits without touching in-flight jobs
+janitor = TempJanitor(
+    config.temp_dir,
+    max_age=config.temp_max_age,
+    max_bytes=config.temp_max_bytes,
+    in_flight=jobs.store.active_files,
+    protected=(config.cache_path, getattr(jobs.store, 'path', None))
+)
+if config.cleanup_interval > 0:
+    janitor.start(config.cleanup_interval)
+
+# Event streams send at most one update per interval, and a comment when idle
+# so proxies do not close the connection
+EVENT_INTERVAL = 0.25
+EVENT_KEEPALIVE = 15.0
+
+# MIME types for compressed downloads that are not decoded by the client
+COMPRESSED_MIMETYPES = {'gzip': 'application/gzip', 'zstd': 'application/zstd'}
+
+
+def strip_compression_suffix(filename):
+    """Return filename without a trailing .gz/.zst suffix."""
+    if compression_for_path(filename):
+        return os.path.splitext(filename)[0]
+    return filename
+
+
+def job_state(job):
+    """Return a job's state for the API, with stats once it has finished."""
+    version, state = job.snapshot()
+    state['success'] = state['status'] == DONE
+    state['stats'] = result_stats(job.result) if state['status'] == DONE else None
+    return version, state
+
+
+def result_stats(result):
+    """Summarise a successful ProcessingResult for the API."""
+    return {
+        'total_products': int(result.total_products),
+        'active_products': int(result.active_products),
+        'edited_titles': int(result.edited_titles),
+        'unique_rewrites': int(result.rewrite_groups),
+        'dedup_ratio': round(result.dedup_ratio, 2),
+        'failed_rewrites': int(result.failed_rewrites),
+        'processing_time': round(result.processing_time, 2),
+        'warmup_time': round(result.warmup_time, 2)
+    }
+
+
+def format_size(size):
+    """Format a byte count for display, e.g. "16MB" or "1GB"."""
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            return f"{size:.0f}{unit}" if size == int(size) else f"{size:.1f}{unit}"
+        size /= 1024
 
 
 @app.route('/')
 def index():
     """Serve the main web interface."""
-    return render_template('index.html')
+    return render_template('index.html', max_file_size=format_size(config.max_file_size))
 
 
 @app.route('/api/upload', methods=['POST'])
 def upload_file():
-    """Handle CSV file upload and processing."""
+    """Queue an uploaded CSV file for processing and return its job id."""
     try:
         if 'file' not in request.files:
             return jsonify({'error': 'No file provided'}), 400
@@ -46,45 +139,46 @@ def upload_file():
         if file.filename == '':
             return jsonify({'error': 'No file selected'}), 400
         
-        if not file.filename.lower().endswith('.csv'):
-            return jsonify({'error': 'Only CSV files are allowed'}), 400
+        # The header was validated and candidates counted while the body
+        # streamed in; this checks the final record
+        sink = file.stream
+        sink.finish()
         
-        # Generate unique filename
+        # The job outlives this request, so it takes over the upload (still
+        # compressed, if it was): small uploads in memory, larger ones as the
+        # file they spilled to, which the worker deletes when done
         filename = secure_filename(file.filename)
-        unique_filename = f"{uuid.uuid4()}_{filename}"
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
-        
-        # Save uploaded file
-        file.save(file_path)
-        
-        # Process the file
-        result = processor.process_csv(file_path)
-        
-        # Store result for download
-        job_id = str(uuid.uuid4())
-        processing_results[job_id] = {
-            'result': result,
-            'original_filename': filename,
-            'output_filename': os.path.basename(result.output_file) if result.success else None
-        }
+        base_name = os.path.splitext(strip_compression_suffix(filename))[0]
+        output_file = (
+            f"{os.path.join(app.config['UPLOAD_FOLDER'], str(uuid.uuid4()))}"
+            f"_{base_name}_optimized_{int(time.time())}.csv"
+            f"{SUFFIXES.get(config.output_compression, '')}"
+        )
+        input_data = sink.getvalue()
+        sink.close()
         
-        # Clean up uploaded file
-        os.remove(file_path)
+        try:
+            job = jobs.submit(
+                sink.path or '',
+                output_file,
+                filename,
+                input_data=input_data,
+                candidate_rows=sink.inspector.candidate_rows
+            )
+        except QueueFullError as e:
+            sink.discard()
+            return jsonify({'error': str(e)}), 503
         
-        if result.success:
-            return jsonify({
-                'job_id': job_id,
-                'message': 'File processed successfully',
-                'stats': {
-                    'total_products': int(result.total_products),
-                    'active_products': int(result.active_products),
-                    'edited_titles': int(result.edited_titles),
-                    'processing_time': round(result.processing_time, 2)
-                }
-            }), 200
-        else:
-            return jsonify({'error': result.error_message}), 500
+        return jsonify({
+            'job_id': job.job_id,
+            'status': job.status,
+            'rows': sink.inspector.rows,
+            'candidate_rows': sink.inspector.candidate_rows,
+            'message': 'File queued for processing'
+        }), 202
             
+    except UploadRejected as e:
+        return jsonify({'error': str(e)}), 400
     except RequestEntityTooLarge:
         return jsonify({'error': 'File too large'}), 413
     except (OSError, ValueError, RuntimeError) as e:
@@ -94,51 +188,99 @@ def upload_file():
 @app.route('/api/download/<job_id>')
 def download_file(job_id):
     """Download processed CSV file."""
-    if job_id not in processing_results:
+    job = jobs.get(job_id)
+    if job is None:
         return jsonify({'error': 'Job not found'}), 404
     
-    job_data = processing_results[job_id]
-    result = job_data['result']
-    
-    if not result.success:
-        return jsonify({'error': 'Processing failed'}), 500
+    if job.status != DONE:
+        return jsonify({'error': f'Job is {job.status}', 'status': job.status}), 409
     
+    result = job.result
     if not os.path.exists(result.output_file):
         return jsonify({'error': 'Output file not found'}), 404
     
-    return send_file(
-        result.output_file,
-        as_attachment=True,
-        download_name=f"optimized_{job_data['original_filename']}",
-        mimetype='text/csv'
-    )
+    download_name = f"optimized_{strip_compression_suffix(job.filename)}"
+    compression = compression_for_path(result.output_file)
+    if compression is None:
+        return send_file(result.output_file, as_attachment=True, download_name=download_name, mimetype='text/csv')
+    
+    # Serve the compressed bytes as they are: clients that accept the encoding
+    # decode them into the CSV, others download the compressed file
+    if compression in request.accept_encodings:
+        response = send_file(
+            result.output_file,
+            as_attachment=True,
+            download_name=download_name,
+            mimetype='text/csv'
+        )
+        response.headers['Content-Encoding'] = compression
+    else:
+        response = send_file(
+            result.output_file,
+            as_attachment=True,
+            download_name=download_name + SUFFIXES[compression],
+            mimetype=COMPRESSED_MIMETYPES[compression]
+        )
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
 
 
 @app.route('/api/status/<job_id>')
 def get_status(job_id):
-    """Get processing status for a job."""
-    if job_id not in processing_results:
+    """Get the state of a job, with live progress counters while it runs."""
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    return jsonify(job_state(job)[1])
+
+
+@app.route('/api/jobs/<job_id>/events')
+def job_events(job_id):
+    """
+    Stream a job's progress as Server-Sent Events until it finishes.
+    
+    Sends a "progress" event (the /api/status payload) as rows are rewritten,
+    then a single "done" or "failed" event and closes the stream.
+    """
+    job = jobs.get(job_id)
+    if job is None:
         return jsonify({'error': 'Job not found'}), 404
     
-    job_data = processing_results[job_id]
-    result = job_data['result']
+    def generate():
+        seen = -1
+        while True:
+            changed = jobs.wait_for_change(job_id, seen, EVENT_KEEPALIVE)
+            if changed is None:
+                if jobs.get(job_id) is None:
+                    yield f"event: failed\ndata: {json.dumps({'job_id': job_id, 'error': 'Job expired'})}\n\n"
+                    return
+                yield ': keep-alive\n\n'
+                continue
+            seen, state = job_state(changed)
+            event = state['status'] if state['status'] in (DONE, FAILED) else 'progress'
+            yield f"event: {event}\ndata: {json.dumps(state)}\n\n"
+            if event != 'progress':
+                return
+            # Coalesce bursts of per-row updates into one event per interval
+            time.sleep(EVENT_INTERVAL)
     
-    return jsonify({
-        'success': result.success,
-        'stats': {
-            'total_products': int(result.total_products),
-            'active_products': int(result.active_products),
-            'edited_titles': int(result.edited_titles),
-            'processing_time': round(result.processing_time, 2)
-        } if result.success else None,
-        'error': result.error_message if not result.success else None
-    })
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
 
 
 @app.route('/api/health')
 def health_check():
     """Health check endpoint."""
-    return jsonify({'status': 'healthy', 'version': '1.0.0'})
+    return jsonify({
+        'status': 'healthy',
+        'version': '1.0.0',
+        'queued_jobs': jobs.queued(),
+        'temp_cleanup': janitor.metrics()
+    })
 
 
 
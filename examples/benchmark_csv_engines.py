@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Compare the pandas and PyArrow CSV engines on a Shopify export.
+
+Uses the stub backend, so only CSV parsing, candidate selection and
+writing are measured. Requires pyarrow (pip install shopify-seo-tool[arrow]).
+
+Usage:
+    python examples/benchmark_csv_engines.py [input.csv] [--repeat N]
+"""
+
+import os
+import sys
+import argparse
+import tempfile
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from shopify_seo import ShopifySEOProcessor, Config
+from shopify_seo import arrow_io
+from shopify_seo.csv_io import open_binary, read_header_binary, normalize_columns
+
+DEFAULT_INPUT = os.path.join(os.path.dirname(__file__), "..", "data", "products_export_1.csv")
+
+
+def frame_memory(engine: str, input_file: str) -> int:
+    """Return the in-memory size in bytes of the parsed export."""
+    if engine == "pandas":
+        df = pd.read_csv(input_file, dtype=str)
+    else:
+        stream, release = open_binary(input_file)
+        try:
+            columns = normalize_columns(read_header_binary(stream))
+            df = next(arrow_io.read_frames(stream, columns))
+        finally:
+            release()
+    return int(df.memory_usage(deep=True).sum())
+
+
+def time_engine(engine: str, input_file: str, output_dir: str, repeat: int) -> float:
+    """Return the best end-to-end process_csv time over repeat runs."""
+    processor = ShopifySEOProcessor(Config(backend="stub", csv_engine=engine, temp_dir=output_dir))
+    output_file = os.path.join(output_dir, f"bench_{engine}.csv")
+    best = float("inf")
+    try:
+        for _ in range(repeat):
+            result = processor.process_csv(input_file, output_file, progress_callback=None)
+            if not result.success:
+                raise RuntimeError(result.error_message)
+            best = min(best, result.processing_time)
+    finally:
+        processor.close()
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the pandas and PyArrow CSV engines")
+    parser.add_argument("input_file", nargs="?", default=DEFAULT_INPUT, help="Shopify CSV export")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per engine; the best is reported")
+    args = parser.parse_args()
+
+    arrow_io.require_pyarrow()
+    size_mb = os.path.getsize(args.input_file) / 1024 / 1024
+    print(f"📁 Input: {args.input_file} ({size_mb:.1f} MB)")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as output_dir:
+        for engine in ("pandas", "pyarrow"):
+            results[engine] = (
+                time_engine(engine, args.input_file, output_dir, args.repeat),
+                frame_memory(engine, args.input_file)
+            )
+            seconds, memory = results[engine]
+            print(f"⏱️  {engine:8} process_csv: {seconds:.3f}s | parsed frame: {memory / 1024 / 1024:.1f} MB")
+
+    (pandas_time, pandas_memory), (arrow_time, arrow_memory) = results["pandas"], results["pyarrow"]
+    print(f"📊 PyArrow speed-up: {pandas_time / arrow_time:.2f}x | "
+          f"memory: {arrow_memory / pandas_memory:.0%} of pandas")
+
+
+if __name__ == "__main__":
+    main()
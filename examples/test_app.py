@@ -81,6 +81,68 @@ def test_package():
     assert result.success == True
     print("   ✅ Processing result structure test passed")
     
+    # Test 5: End-to-end processing with the stub backend (no Ollama needed)
+    print("5. Testing End-to-End Processing (stub backend)...")
+    stub_config = Config(backend="stub", temp_dir=tempfile.mkdtemp())
+    stub_processor = ShopifySEOProcessor(stub_config)
+    result = stub_processor.process_csv(test_csv)
+    assert result.success, f"Processing failed: {result.error_message}"
+    assert result.edited_titles == 2
+    output = pd.read_csv(result.output_file, dtype=str)
+    assert all(len(t) <= stub_config.max_title_length for t in output["Edited Title"])
+    stub_processor.close()
+    print("   ✅ End-to-end processing test passed")
+
+    # Test 6: A single Ollama endpoint survives one transient error
+    print("6. Testing Retry After a Transient Error (single endpoint)...")
+
+    class FlakyClient:
+        """Ollama client whose first request fails."""
+
+        def __init__(self):
+            self.calls = 0
+
+        def chat(self, **kwargs):
+            self.calls += 1
+            if self.calls == 1:
+                raise ConnectionError("transient failure")
+            return {"message": {"content": "Optimised Product Title"}}
+
+    retry_config = Config(backend="ollama", retry_backoff=0.01, temp_dir=tempfile.mkdtemp())
+    retry_processor = ShopifySEOProcessor(retry_config)
+    client = FlakyClient()
+    retry_processor.backend._endpoints[0].client = client
+    result = retry_processor.process_csv(test_csv)
+    assert result.success, f"Processing failed: {result.error_message}"
+    assert result.failed_rewrites == 0
+    assert client.calls == 3
+    assert retry_processor.breaker.state == "closed"
+    retry_processor.close()
+    print("   ✅ Transient error retry test passed")
+
+    # Test 7: Passthrough copies every input byte (BOM, CRLF, quoted newlines)
+    print("7. Testing Passthrough Byte Fidelity...")
+    long_title = "This is a very long SEO title that exceeds the maximum character limit for optimal search"
+    records = [
+        "Handle,Title,Body (HTML),Status,SEO Title,SEO Description,,Title",
+        f'test-product-1,Test Product 1,"<p>Line one</p>\r\n<p>Line ""two""</p>",active,{long_title},SEO description 1,x,dup',
+        'test-product-2,Test Product 2,"<p>One, two</p>\n",draft,Short title,SEO description 2,,  spaced  ',
+    ]
+    passthrough_dir = tempfile.mkdtemp()
+    passthrough_csv = os.path.join(passthrough_dir, "bom_crlf.csv")
+    with open(passthrough_csv, "wb") as fh:
+        fh.write(b"\xef\xbb\xbf" + "\r\n".join(records).encode("utf-8") + b"\r\n")
+    passthrough_processor = ShopifySEOProcessor(Config(backend="stub", passthrough=True, temp_dir=passthrough_dir))
+    result = passthrough_processor.process_csv(passthrough_csv)
+    assert result.success, f"Processing failed: {result.error_message}"
+    edited = pd.read_csv(result.output_file, dtype=str)["Edited Title"].tolist()
+    assert edited[0] != long_title and len(edited[0]) <= config.max_title_length
+    expected = [records[0] + ",Edited Title"] + [f"{record},{title}" for record, title in zip(records[1:], edited)]
+    with open(result.output_file, "rb") as fh:
+        assert fh.read() == b"\xef\xbb\xbf" + "\r\n".join(expected).encode("utf-8") + b"\r\n"
+    passthrough_processor.close()
+    print("   ✅ Passthrough byte fidelity test passed")
+
     # Cleanup
     os.unlink(test_csv)
     
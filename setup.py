@@ -30,6 +30,12 @@ setup(
             "flake8>=5.0.0",
             "mypy>=1.0.0",
         ],
+        "arrow": [
+            "pyarrow>=14.0.0",
+        ],
+        "zstd": [
+            "zstandard>=0.18.0",
+        ],
     },
     entry_points={
         "console_scripts": [
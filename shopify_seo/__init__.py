@@ -7,5 +7,14 @@ __author__ = "Joshua Hellewell"
 
 from .processor import ShopifySEOProcessor
 from .config import Config
+from .backends import RewriteBackend, OllamaBackend, StubBackend
+from .progress import ProgressEvent
 
-__all__ = ["ShopifySEOProcessor", "Config"]
+__all__ = [
+    "ShopifySEOProcessor",
+    "Config",
+    "RewriteBackend",
+    "OllamaBackend",
+    "StubBackend",
+    "ProgressEvent",
+]
@@ -0,0 +1,123 @@
+"""
+PyArrow-based CSV reading and writing for Shopify SEO tool.
+
+pyarrow is optional: install it with ``pip install shopify-seo-tool[arrow]``.
+"""
+
+from typing import IO, List, Iterator
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # pragma: no cover - exercised only without pyarrow
+    pa = None
+    pa_csv = None
+
+
+def require_pyarrow() -> None:
+    """
+    Raise a helpful error if pyarrow is not installed.
+
+    Raises:
+        ImportError: If pyarrow cannot be imported
+    """
+    if pa is None:
+        raise ImportError(
+            "The 'pyarrow' CSV engine requires pyarrow. "
+            "Install it with: pip install shopify-seo-tool[arrow]"
+        )
+
+
+def _string_dtype() -> "pd.ArrowDtype":
+    return pd.ArrowDtype(pa.string())
+
+
+def _to_frame(table: "pa.Table") -> pd.DataFrame:
+    return table.to_pandas(types_mapper={pa.string(): _string_dtype()}.get)
+
+
+def read_frames(stream: IO[bytes], columns: List[str], chunk_size: int = 0) -> Iterator[pd.DataFrame]:
+    """
+    Parse CSV data rows with the multithreaded PyArrow reader.
+
+    Every column is read as an Arrow-backed string, with blank fields as nulls.
+
+    Args:
+        stream: Binary stream positioned at the first data row
+        columns: Column names from the header
+        chunk_size: Rows per yielded frame (0 = a single frame)
+
+    Returns:
+        Iterator of DataFrames with Arrow string dtypes
+    """
+    require_pyarrow()
+    read_options = pa_csv.ReadOptions(column_names=columns, use_threads=True)
+    parse_options = pa_csv.ParseOptions(newlines_in_values=True)
+    convert_options = pa_csv.ConvertOptions(
+        column_types={col: pa.string() for col in columns},
+        strings_can_be_null=True
+    )
+
+    empty = pa.table({col: pa.array([], pa.string()) for col in columns})
+    try:
+        if chunk_size <= 0:
+            yield _to_frame(pa_csv.read_csv(
+                stream,
+                read_options=read_options,
+                parse_options=parse_options,
+                convert_options=convert_options
+            ))
+            return
+        reader = pa_csv.open_csv(
+            stream,
+            read_options=read_options,
+            parse_options=parse_options,
+            convert_options=convert_options
+        )
+    except pa.ArrowInvalid as e:
+        if "Empty CSV file" not in str(e):
+            raise
+        # Header-only file
+        yield _to_frame(empty)
+        return
+
+    # Re-slice the reader's byte-sized blocks into chunk_size-row frames
+    pending: List["pa.RecordBatch"] = []
+    pending_rows = 0
+    yielded = False
+    for batch in reader:
+        pending.append(batch)
+        pending_rows += batch.num_rows
+        while pending_rows >= chunk_size:
+            table = pa.Table.from_batches(pending)
+            yield _to_frame(table.slice(0, chunk_size))
+            yielded = True
+            rest = table.slice(chunk_size)
+            pending = rest.to_batches()
+            pending_rows = rest.num_rows
+    if pending_rows or not yielded:
+        yield _to_frame(pa.Table.from_batches(pending) if pending else empty)
+
+
+def write_frame(out: IO[bytes], df: pd.DataFrame, include_header: bool) -> None:
+    """
+    Write a frame as CSV with the PyArrow writer.
+
+    Args:
+        out: Binary output stream
+        df: Frame to write; all columns are written as strings
+        include_header: Whether to write the header row
+    """
+    require_pyarrow()
+    string_dtype = _string_dtype()
+    arrays = []
+    for col in df.columns:
+        values = df[col]
+        if values.dtype != string_dtype:
+            values = values.astype(string_dtype)
+        # Columns read by read_frames() are already Arrow strings: this is zero-copy
+        arrays.append(pa.chunked_array(values.array.__arrow_array__()))
+    table = pa.Table.from_arrays(arrays, names=[str(col) for col in df.columns])
+    pa_csv.write_csv(table, out, pa_csv.WriteOptions(include_header=include_header))
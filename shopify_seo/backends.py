@@ -0,0 +1,273 @@
+"""
+Rewrite backends for Shopify SEO tool.
+
+A backend turns a system/user prompt pair into raw model output. The
+processor builds prompts and parses replies; backends only transport them.
+"""
+
+import re
+import json
+import time
+import threading
+from typing import Optional, Dict, Any, List, Protocol, Callable, TypeVar
+
+import ollama
+
+from .config import Config
+
+T = TypeVar("T")
+
+
+class RewriteBackend(Protocol):
+    """Interface implemented by every rewrite backend."""
+
+    def chat(
+        self,
+        system: str,
+        prompt: str,
+        format: Optional[Dict[str, Any]] = None,
+        options: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Send a prompt and return the raw content of the reply."""
+        ...
+
+    def warm_up(self) -> None:
+        """Prepare the backend (e.g. load the model) before the first request."""
+        ...
+
+
+class _Endpoint:
+    """Book-keeping for one Ollama server."""
+
+    def __init__(self, url: Optional[str], client: ollama.Client):
+        self.url = url or "default"
+        self.client = client
+        self.in_flight = 0
+        self.last_pick = 0
+        self.ejected_until = 0.0
+        # Set after a failure; cleared by the first successful probe
+        self.suspect = False
+
+
+class OllamaBackend:
+    """
+    Backend that sends requests to one or more Ollama servers.
+
+    With several Config.endpoints, each request goes to the healthy endpoint
+    with the fewest in-flight requests (ties go to the least recently used).
+    An endpoint that fails is ejected for Config.endpoint_cooldown seconds;
+    afterwards a single probe request is sent to it before it rejoins the pool.
+    The last endpoint in rotation (e.g. the only one) is never ejected.
+    """
+
+    def __init__(self, config: Config):
+        """
+        Initialize the backend.
+
+        Args:
+            config: Configuration providing model name, endpoints, timeout and keep_alive
+        """
+        self.config = config
+        urls: List[Optional[str]] = list(config.endpoints) or [None]
+        self._endpoints = [
+            _Endpoint(url, ollama.Client(host=url, timeout=config.api_timeout))
+            for url in urls
+        ]
+        self._lock = threading.Lock()
+        self._picks = 0
+
+    def _acquire(self) -> _Endpoint:
+        """Reserve the least-loaded healthy endpoint."""
+        with self._lock:
+            now = time.monotonic()
+            available = [
+                ep for ep in self._endpoints
+                if ep.ejected_until <= now and not (ep.suspect and ep.in_flight)
+            ]
+            if not available:
+                raise ConnectionError("No healthy Ollama endpoints available")
+            endpoint = min(available, key=lambda ep: (ep.in_flight, ep.last_pick))
+            self._picks += 1
+            endpoint.last_pick = self._picks
+            endpoint.in_flight += 1
+            return endpoint
+
+    def _release(self, endpoint: _Endpoint, healthy: bool) -> None:
+        """Return an endpoint to the pool, ejecting it if the request failed."""
+        with self._lock:
+            endpoint.in_flight -= 1
+            if healthy:
+                endpoint.suspect = False
+            else:
+                self._eject(endpoint)
+
+    def _eject(self, endpoint: _Endpoint) -> None:
+        """Take an endpoint out of rotation until the cooldown passes (lock held)."""
+        now = time.monotonic()
+        if not any(ep is not endpoint and ep.ejected_until <= now for ep in self._endpoints):
+            # Never eject the last endpoint in rotation: that would fail every
+            # retry without reaching the model. Retries and the circuit breaker
+            # handle its failures instead.
+            return
+        endpoint.suspect = True
+        endpoint.ejected_until = time.monotonic() + self.config.endpoint_cooldown
+
+    def _dispatch(self, call: Callable[[ollama.Client], T]) -> T:
+        """Run call against the selected endpoint's client."""
+        endpoint = self._acquire()
+        try:
+            result = call(endpoint.client)
+        except ollama.ResponseError as e:
+            # The server answered, so only server-side errors count against it
+            self._release(endpoint, healthy=e.status_code < 500)
+            raise
+        except Exception:
+            self._release(endpoint, healthy=False)
+            raise
+        self._release(endpoint, healthy=True)
+        return result
+
+    def endpoint_status(self) -> List[Dict[str, Any]]:
+        """Return a snapshot of each endpoint's load and health."""
+        with self._lock:
+            now = time.monotonic()
+            return [
+                {
+                    "url": ep.url,
+                    "in_flight": ep.in_flight,
+                    "healthy": ep.ejected_until <= now and not ep.suspect
+                }
+                for ep in self._endpoints
+            ]
+
+    def chat(
+        self,
+        system: str,
+        prompt: str,
+        format: Optional[Dict[str, Any]] = None,
+        options: Optional[Dict[str, Any]] = None
+    ) -> str:
+        kwargs: Dict[str, Any] = {}
+        if format is not None:
+            kwargs["format"] = format
+        if options is not None:
+            kwargs["options"] = options
+        if self.config.keep_alive is not None:
+            kwargs["keep_alive"] = self.config.keep_alive
+
+        response = self._dispatch(lambda client: client.chat(
+            model=self.config.model_name,
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": prompt}
+            ],
+            **kwargs
+        ))
+        return response.get("message", {}).get("content", "")
+
+    def warm_up(self) -> None:
+        kwargs: Dict[str, Any] = {}
+        if self.config.keep_alive is not None:
+            kwargs["keep_alive"] = self.config.keep_alive
+
+        # Load the model on every endpoint; one that fails is ejected like any other
+        errors = []
+        for endpoint in self._endpoints:
+            try:
+                # An empty prompt loads the model into memory without generating
+                endpoint.client.generate(model=self.config.model_name, prompt="", **kwargs)
+            except Exception as e:
+                with self._lock:
+                    self._eject(endpoint)
+                errors.append(f"{endpoint.url}: {e}")
+        if len(errors) == len(self._endpoints):
+            raise ConnectionError("; ".join(errors))
+
+
+class StubBackend:
+    """
+    Deterministic in-process backend for benchmarks, CI and load tests.
+
+    Titles are read back out of the prompt and rewritten by a fixed rule:
+
+    - "truncate": trim to the last whole word within max_title_length
+    - "echo": return the original title unchanged
+    - "fail": raise ConnectionError, simulating an unreachable model host
+
+    Replies follow the shape the processor asked for: plain text, a JSON
+    array for batches, or JSON objects when a format schema is given.
+    """
+
+    RULES = ("truncate", "echo", "fail")
+
+    def __init__(self, max_title_length: int = 53, latency: float = 0.0, rule: str = "truncate"):
+        """
+        Initialize the stub.
+
+        Args:
+            max_title_length: Length limit applied by the "truncate" rule
+            latency: Artificial delay per request in seconds
+            rule: Output rule, one of StubBackend.RULES
+        """
+        if rule not in self.RULES:
+            raise ValueError(f"Unknown stub rule '{rule}'. Expected one of: {', '.join(self.RULES)}")
+        self.max_title_length = max_title_length
+        self.latency = latency
+        self.rule = rule
+
+    def _apply_rule(self, title: str) -> str:
+        if self.rule == "echo" or len(title) <= self.max_title_length:
+            return title
+        trimmed = title[:self.max_title_length].rsplit(" ", 1)[0]
+        return trimmed.strip() or title[:self.max_title_length]
+
+    def chat(
+        self,
+        system: str,
+        prompt: str,
+        format: Optional[Dict[str, Any]] = None,
+        options: Optional[Dict[str, Any]] = None
+    ) -> str:
+        if self.latency:
+            time.sleep(self.latency)
+        if self.rule == "fail":
+            raise ConnectionError("Stub backend configured to fail")
+
+        titles: List[str] = [
+            self._apply_rule(t.strip())
+            for t in re.findall(r'Original Title:(.*)', prompt)
+        ]
+        is_batch = len(titles) > 1 or "titles" in (format or {}).get("properties", {})
+
+        if is_batch:
+            return json.dumps({"titles": titles} if format else titles)
+        title = titles[0] if titles else ""
+        return json.dumps({"title": title}) if format else title
+
+    def warm_up(self) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+
+
+def create_backend(config: Config) -> RewriteBackend:
+    """
+    Create the rewrite backend selected by Config.backend.
+
+    Args:
+        config: Configuration object
+
+    Returns:
+        Backend instance
+
+    Raises:
+        ValueError: If the backend name is not recognised
+    """
+    if config.backend == "ollama":
+        return OllamaBackend(config)
+    if config.backend == "stub":
+        return StubBackend(
+            max_title_length=config.max_title_length,
+            latency=config.stub_latency,
+            rule=config.stub_rule
+        )
+    raise ValueError(f"Unknown backend '{config.backend}'. Expected 'ollama' or 'stub'")
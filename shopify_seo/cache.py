@@ -0,0 +1,101 @@
+"""
+Persistent rewrite cache for Shopify SEO tool.
+"""
+
+import os
+import json
+import sqlite3
+import hashlib
+import threading
+from typing import Optional
+
+
+class RewriteCache:
+    """
+    SQLite-backed cache of rewritten titles.
+
+    Entries are keyed by a hash of everything that influences the model
+    output, so a changed model, length limit or prompt never reuses a
+    stale rewrite.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: Path to the SQLite database file
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rewrites ("
+            " key TEXT PRIMARY KEY,"
+            " title TEXT NOT NULL,"
+            " created_at REAL NOT NULL DEFAULT (julianday('now'))"
+            ")"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(
+        title: str,
+        description: str,
+        model_name: str,
+        max_title_length: int,
+        prompt_fingerprint: str
+    ) -> str:
+        """
+        Build the cache key for a rewrite request.
+
+        Args:
+            title: Original title
+            description: Product description
+            model_name: Model used for the rewrite
+            max_title_length: Maximum title length
+            prompt_fingerprint: Fingerprint of the system prompt
+
+        Returns:
+            Hex digest identifying the request
+        """
+        payload = json.dumps([
+            " ".join(str(title).split()),
+            " ".join(str(description).split()),
+            model_name,
+            int(max_title_length),
+            prompt_fingerprint,
+        ])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached title for key, or None on a miss."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT title FROM rewrites WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, title: str) -> None:
+        """Store a rewritten title under key."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO rewrites (key, title) VALUES (?, ?)",
+                (key, title)
+            )
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM rewrites").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
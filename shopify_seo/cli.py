@@ -5,10 +5,56 @@ Command-line interface for Shopify SEO Tool.
 import argparse
 import sys
 import os
+import threading
 from pathlib import Path
 
 from .processor import ShopifySEOProcessor
-from .config import Config
+from .config import Config, parse_keep_alive, parse_size
+from .csv_io import validate_header
+from .janitor import TempJanitor
+from .job_store import create_job_store
+
+
+def _add_processing_options(parser: argparse.ArgumentParser) -> None:
+    """Add the model and processing options shared by process and process-dir."""
+    parser.add_argument('--max-length', type=int, default=53,
+                        help='Maximum title length (default: 53)')
+    parser.add_argument('--model', default='gpt-oss:latest',
+                        help='AI model name (default: gpt-oss:latest)')
+    parser.add_argument('--backend', choices=['ollama', 'stub'], default='ollama',
+                        help='Rewrite backend; "stub" needs no model (default: ollama)')
+    parser.add_argument('--endpoint', action='append', dest='endpoints', default=[],
+                        help='Ollama server URL; repeat to spread requests over several hosts')
+    parser.add_argument('--temp-dir', default='temp',
+                        help='Temporary directory (default: temp)')
+    parser.add_argument('--concurrency', type=int, default=1,
+                        help='Number of parallel model requests (default: 1)')
+    parser.add_argument('--batch-size', type=int, default=1,
+                        help='Titles sent per model request (default: 1)')
+    parser.add_argument('--structured-output', action='store_true',
+                        help='Request JSON-schema constrained output from the model')
+    parser.add_argument('--warm-up', action='store_true',
+                        help='Preload the model before processing')
+    parser.add_argument('--keep-alive',
+                        help='How long Ollama keeps the model loaded, e.g. 30m or -1')
+    parser.add_argument('--chunk-size', type=int, default=0,
+                        help='Stream the file in chunks of this many rows (default: 0, load whole file)')
+    parser.add_argument('--passthrough', action='store_true',
+                        help='Parse only the working columns and copy all others byte-for-byte')
+    parser.add_argument('--engine', dest='csv_engine', choices=['pandas', 'pyarrow'], default='pandas',
+                        help='CSV parser and writer; "pyarrow" is multithreaded (default: pandas)')
+    parser.add_argument('--output-mode', choices=['full', 'changes'], default='full',
+                        help='"changes" writes only Handle and SEO Title for products whose title changed (default: full)')
+    parser.add_argument('--compress', dest='output_compression', choices=['gzip', 'zstd'], default='',
+                        help='Compress the output file (default: none, or from a .gz/.zst output name)')
+    parser.add_argument('--cache', dest='cache_path',
+                        help='SQLite rewrite cache path (default: disabled)')
+    parser.add_argument('--resume', action='store_true',
+                        help='Continue an interrupted run from its checkpoint journal')
+    parser.add_argument('--checkpoint-interval', type=int, default=25,
+                        help='Rewrites between checkpoint journal flushes (default: 25, 0 disables)')
+    parser.add_argument('--verbose', '-v', action='store_true',
+                        help='Verbose output')
 
 
 def main():
@@ -21,7 +67,13 @@ Examples:
   shopify-seo process products.csv
   shopify-seo process products.csv -o optimized_products.csv
   shopify-seo process products.csv --max-length 60
+  shopify-seo process products.csv --concurrency 4
+  shopify-seo process products.csv --concurrency 8 --endpoint http://gpu1:11434 --endpoint http://gpu2:11434
+  shopify-seo process products.csv --batch-size 20
+  shopify-seo process products.csv --cache temp/rewrites.sqlite
+  shopify-seo process-dir exports/ -o optimized/ --concurrency 8
   shopify-seo validate products.csv
+  shopify-seo clean --max-age 3600 --max-bytes 500M
         """
     )
     
@@ -31,19 +83,31 @@ Examples:
     process_parser = subparsers.add_parser('process', help='Process a Shopify CSV file')
     process_parser.add_argument('input_file', help='Input CSV file path')
     process_parser.add_argument('-o', '--output', help='Output CSV file path')
-    process_parser.add_argument('--max-length', type=int, default=53,
-                               help='Maximum title length (default: 53)')
-    process_parser.add_argument('--model', default='gpt-oss:latest',
-                               help='AI model name (default: gpt-oss:latest)')
-    process_parser.add_argument('--temp-dir', default='temp',
-                               help='Temporary directory (default: temp)')
-    process_parser.add_argument('--verbose', '-v', action='store_true',
-                               help='Verbose output')
+    process_parser.add_argument('--since', metavar='PREVIOUS_CSV',
+                               help='Optimized output of a previous run; only new or changed products are rewritten')
+    _add_processing_options(process_parser)
+    
+    # Process-dir command
+    process_dir_parser = subparsers.add_parser('process-dir', help='Process every Shopify CSV file in a directory')
+    process_dir_parser.add_argument('input_dir', help='Directory of CSV exports (.csv, .csv.gz, .csv.zst)')
+    process_dir_parser.add_argument('-o', '--output-dir', help='Output directory (default: the temp directory)')
+    process_dir_parser.add_argument('--parallel-files', type=int,
+                                    help='Files processed at once (default: the concurrency)')
+    _add_processing_options(process_dir_parser)
     
     # Validate command
     validate_parser = subparsers.add_parser('validate', help='Validate a CSV file')
     validate_parser.add_argument('input_file', help='Input CSV file path')
     
+    # Clean command
+    clean_parser = subparsers.add_parser('clean', help='Delete old files from the temp directory')
+    clean_parser.add_argument('--temp-dir', help='Directory to clean (default: the temp directory)')
+    clean_parser.add_argument('--max-age', type=int,
+                              help='Delete files older than this many seconds (0 = no age limit)')
+    clean_parser.add_argument('--max-bytes', type=parse_size,
+                              help='Trim the directory to this size, oldest files first, e.g. 500M (0 = no quota)')
+    clean_parser.add_argument('--dry-run', action='store_true', help='Report what would be deleted without deleting it')
+    
     # Config command
     config_parser = subparsers.add_parser('config', help='Show current configuration')
     
@@ -56,8 +120,12 @@ Examples:
     try:
         if args.command == 'process':
             process_command(args)
+        elif args.command == 'process-dir':
+            process_dir_command(args)
         elif args.command == 'validate':
             validate_command(args)
+        elif args.command == 'clean':
+            clean_command(args)
         elif args.command == 'config':
             config_command(args)
     except KeyboardInterrupt:
@@ -68,6 +136,51 @@ Examples:
         sys.exit(1)
 
 
+def _config_from_args(args) -> Config:
+    """Build a Config from the shared processing options."""
+    return Config(
+        model_name=args.model,
+        max_title_length=args.max_length,
+        backend=args.backend,
+        endpoints=tuple(args.endpoints),
+        temp_dir=args.temp_dir,
+        concurrency=args.concurrency,
+        batch_size=args.batch_size,
+        structured_output=args.structured_output,
+        warm_up=args.warm_up,
+        keep_alive=parse_keep_alive(args.keep_alive),
+        cache_path=args.cache_path,
+        chunk_size=args.chunk_size,
+        passthrough=args.passthrough,
+        csv_engine=args.csv_engine,
+        output_mode=args.output_mode,
+        output_compression=args.output_compression,
+        checkpoint_interval=args.checkpoint_interval
+    )
+
+
+def _print_configuration(config: Config) -> None:
+    """Print the configuration for verbose runs."""
+    print(f"🔧 Configuration:")
+    print(f"   Model: {config.model_name}")
+    print(f"   Backend: {config.backend}")
+    if config.endpoints:
+        print(f"   Endpoints: {', '.join(config.endpoints)}")
+    print(f"   Max title length: {config.max_title_length}")
+    print(f"   Temp directory: {config.temp_dir}")
+    print(f"   Concurrency: {config.concurrency}")
+    print(f"   Batch size: {config.batch_size}")
+    print(f"   Structured output: {config.structured_output}")
+    print(f"   Chunk size: {config.chunk_size or 'whole file'}")
+    print(f"   Passthrough: {config.passthrough}")
+    print(f"   CSV engine: {config.csv_engine}")
+    print(f"   Output mode: {config.output_mode}")
+    print(f"   Output compression: {config.output_compression or 'none'}")
+    print(f"   Cache: {config.cache_path or 'disabled'}")
+    print(f"   Checkpoint interval: {config.checkpoint_interval or 'disabled'}")
+    print()
+
+
 def process_command(args):
     """Handle the process command."""
     input_file = Path(args.input_file)
@@ -76,27 +189,21 @@ def process_command(args):
         print(f"❌ Input file not found: {input_file}")
         sys.exit(1)
     
-    # Create configuration
-    config = Config(
-        model_name=args.model,
-        max_title_length=args.max_length,
-        temp_dir=args.temp_dir
-    )
-    
-    # Initialize processor
+    # Create configuration and initialize processor
+    config = _config_from_args(args)
     processor = ShopifySEOProcessor(config)
     
     if args.verbose:
-        print(f"🔧 Configuration:")
-        print(f"   Model: {config.model_name}")
-        print(f"   Max title length: {config.max_title_length}")
-        print(f"   Temp directory: {config.temp_dir}")
-        print()
+        _print_configuration(config)
     
     print(f"📁 Processing file: {input_file}")
     
     # Process the file
-    result = processor.process_csv(str(input_file), args.output)
+    if args.since and not Path(args.since).exists():
+        print(f"❌ Previous optimized CSV not found: {args.since}")
+        sys.exit(1)
+    
+    result = processor.process_csv(str(input_file), args.output, resume=args.resume, since=args.since)
     
     if result.success:
         print(f"✅ Processing completed successfully!")
@@ -104,6 +211,18 @@ def process_command(args):
         print(f"   Total products: {result.total_products}")
         print(f"   Active products: {result.active_products}")
         print(f"   Titles edited: {result.edited_titles}")
+        print(f"   Unique rewrites: {result.rewrite_groups} "
+              f"(dedup ratio {result.dedup_ratio:.2f}x)")
+        if result.failed_rewrites:
+            print(f"   ⚠️ Model failures (truncated instead): {result.failed_rewrites}")
+        if config.cache_path:
+            print(f"   Cache hits: {result.cache_hits}")
+        if args.since:
+            print(f"   Unchanged since previous run: {result.unchanged_rows} rows")
+        if result.resumed_rewrites:
+            print(f"   Resumed from checkpoint: {result.resumed_rewrites} rewrites")
+        if result.warmup_time:
+            print(f"   Model warm-up time: {result.warmup_time:.2f} seconds")
         print(f"   Processing time: {result.processing_time:.2f} seconds")
         print(f"📄 Output file: {result.output_file}")
     else:
@@ -111,6 +230,68 @@ def process_command(args):
         sys.exit(1)
 
 
+def process_dir_command(args):
+    """Handle the process-dir command."""
+    input_dir = Path(args.input_dir)
+    
+    if not input_dir.is_dir():
+        print(f"❌ Input directory not found: {input_dir}")
+        sys.exit(1)
+    
+    # One processor for every file: shared backend, cache and concurrency budget
+    config = _config_from_args(args)
+    input_files = sorted(
+        str(path) for path in input_dir.iterdir()
+        if path.is_file() and path.name.lower().endswith(config.allowed_extensions)
+    )
+    if not input_files:
+        print(f"❌ No CSV files found in: {input_dir}")
+        sys.exit(1)
+    
+    processor = ShopifySEOProcessor(config)
+    
+    if args.verbose:
+        _print_configuration(config)
+    
+    # Files finish on different threads; keep their lines from interleaving
+    report_lock = threading.Lock()
+    
+    def report(input_file, event):
+        if event.event == "finished":
+            with report_lock:
+                print(f"   {Path(input_file).name}: {event.edited} titles edited, "
+                      f"{event.completed}/{event.total_rewrites} rewrites in {event.elapsed:.1f}s")
+    
+    print(f"📁 Processing {len(input_files)} files from: {input_dir}")
+    results = processor.process_many(
+        input_files,
+        args.output_dir,
+        progress_callback=report,
+        max_parallel_files=args.parallel_files,
+        resume=args.resume
+    )
+    processor.close()
+    
+    failed = {path: result for path, result in results.items() if not result.success}
+    succeeded = [result for result in results.values() if result.success]
+    print(f"📊 Statistics:")
+    print(f"   Files processed: {len(succeeded)}/{len(results)}")
+    print(f"   Total products: {sum(r.total_products for r in succeeded)}")
+    print(f"   Titles edited: {sum(r.edited_titles for r in succeeded)}")
+    print(f"   Unique rewrites: {sum(r.rewrite_groups for r in succeeded)}")
+    model_failures = sum(r.failed_rewrites for r in succeeded)
+    if model_failures:
+        print(f"   ⚠️ Model failures (truncated instead): {model_failures}")
+    if config.cache_path:
+        print(f"   Cache hits: {sum(r.cache_hits for r in succeeded)}")
+    for result in succeeded:
+        print(f"📄 Output file: {result.output_file}")
+    for path, result in failed.items():
+        print(f"❌ {Path(path).name}: {result.error_message}")
+    if failed:
+        sys.exit(1)
+
+
 def validate_command(args):
     """Handle the validate command."""
     input_file = Path(args.input_file)
@@ -119,8 +300,8 @@ def validate_command(args):
         print(f"❌ Input file not found: {input_file}")
         sys.exit(1)
     
-    processor = ShopifySEOProcessor()
-    is_valid, error_message = processor.validate_csv(str(input_file))
+    # Header-only check: never parses the data rows, so it is fast on huge exports
+    is_valid, error_message = validate_header(str(input_file))
     
     if is_valid:
         print(f"✅ CSV file is valid: {input_file}")
@@ -129,22 +310,104 @@ def validate_command(args):
         sys.exit(1)
 
 
+def clean_command(args):
+    """Handle the clean command."""
+    config = Config.from_env()
+    temp_dir = args.temp_dir or config.temp_dir
+    if not os.path.isdir(temp_dir):
+        print(f"❌ Temp directory not found: {temp_dir}")
+        sys.exit(1)
+    
+    # Files of jobs the web app is still running are only known to a shared job store
+    store = create_job_store(config) if config.job_store == 'sqlite' else None
+    janitor = TempJanitor(
+        temp_dir,
+        max_age=config.temp_max_age if args.max_age is None else args.max_age,
+        max_bytes=config.temp_max_bytes if args.max_bytes is None else args.max_bytes,
+        in_flight=store.active_files if store else None,
+        protected=(config.cache_path, getattr(store, 'path', None))
+    )
+    result = janitor.sweep(dry_run=args.dry_run)
+    
+    verb, reclaimed = ("Would delete", "Would reclaim") if args.dry_run else ("Deleted", "Reclaimed")
+    print(f"🧹 {verb} {result.files_deleted} files from {temp_dir}")
+    print(f"   {reclaimed}: {result.bytes_reclaimed / 1024 / 1024:.1f} MB")
+    print(f"   Remaining: {result.files_remaining} files, {result.bytes_remaining / 1024 / 1024:.1f} MB")
+
+
 def config_command(args):
     """Handle the config command."""
     config = Config.from_env()
     
     print("🔧 Current Configuration:")
     print(f"   Model name: {config.model_name}")
+    print(f"   Backend: {config.backend}")
+    print(f"   Endpoints: {', '.join(config.endpoints) or 'default (OLLAMA_HOST)'}")
     print(f"   Max title length: {config.max_title_length}")
     print(f"   Temp directory: {config.temp_dir}")
     print(f"   Allowed extensions: {config.allowed_extensions}")
     print(f"   Max file size: {config.max_file_size / (1024*1024):.1f} MB")
+    print(f"   Upload spool size: {config.upload_spool_size / (1024*1024):.1f} MB")
     print(f"   API timeout: {config.api_timeout} seconds")
     print(f"   Max retries: {config.max_retries}")
+    print(f"   Retry backoff: {config.retry_backoff} seconds")
+    print(f"   Keep alive: {config.keep_alive if config.keep_alive is not None else 'Ollama default'}")
+    print(f"   Warm up: {config.warm_up}")
+    print(f"   Circuit breaker: {config.circuit_failure_threshold} failures, "
+          f"{config.circuit_reset_timeout} seconds reset")
+    print(f"   Concurrency: {config.concurrency}")
+    print(f"   Batch size: {config.batch_size}")
+    print(f"   Structured output: {config.structured_output}")
+    print(f"   Num predict: {config.num_predict}")
+    print(f"   Chunk size: {config.chunk_size or 'whole file'}")
+    print(f"   Passthrough: {config.passthrough}")
+    print(f"   CSV engine: {config.csv_engine}")
+    print(f"   Output mode: {config.output_mode}")
+    print(f"   Output compression: {config.output_compression or 'none'}")
+    print(f"   Checkpoint interval: {config.checkpoint_interval or 'disabled'}")
+    print(f"   Cache path: {config.cache_path or 'disabled'}")
+    print(f"   Web app job workers: {config.job_workers} (queue size {config.job_queue_size})")
+    print(f"   Web app job store: {config.job_store}")
+    print(f"   Web app job TTL: {f'{config.job_ttl}s' if config.job_ttl else 'no expiry'}")
+    print(f"   Temp max age: {f'{config.temp_max_age}s' if config.temp_max_age else 'no limit'}")
+    print(f"   Temp max size: {f'{config.temp_max_bytes / 1024 / 1024:.0f} MB' if config.temp_max_bytes else 'no quota'}")
+    print(f"   Web app cleanup interval: {f'{config.cleanup_interval}s' if config.cleanup_interval else 'disabled'}")
     print()
     print("💡 Set environment variables to override defaults:")
     print("   SHOPIFY_SEO_MODEL")
+    print("   SHOPIFY_SEO_BACKEND")
+    print("   SHOPIFY_SEO_ENDPOINTS")
+    print("   SHOPIFY_SEO_ENDPOINT_COOLDOWN")
+    print("   SHOPIFY_SEO_STUB_LATENCY")
+    print("   SHOPIFY_SEO_STUB_RULE")
     print("   SHOPIFY_SEO_MAX_TITLE_LENGTH")
     print("   SHOPIFY_SEO_TEMP_DIR")
+    print("   SHOPIFY_SEO_MAX_FILE_SIZE")
+    print("   SHOPIFY_SEO_UPLOAD_SPOOL_SIZE")
     print("   SHOPIFY_SEO_API_TIMEOUT")
     print("   SHOPIFY_SEO_MAX_RETRIES")
+    print("   SHOPIFY_SEO_RETRY_BACKOFF")
+    print("   SHOPIFY_SEO_CIRCUIT_THRESHOLD")
+    print("   SHOPIFY_SEO_CIRCUIT_RESET")
+    print("   SHOPIFY_SEO_KEEP_ALIVE")
+    print("   SHOPIFY_SEO_WARM_UP")
+    print("   SHOPIFY_SEO_CONCURRENCY")
+    print("   SHOPIFY_SEO_BATCH_SIZE")
+    print("   SHOPIFY_SEO_STRUCTURED_OUTPUT")
+    print("   SHOPIFY_SEO_NUM_PREDICT")
+    print("   SHOPIFY_SEO_CHUNK_SIZE")
+    print("   SHOPIFY_SEO_PASSTHROUGH")
+    print("   SHOPIFY_SEO_CSV_ENGINE")
+    print("   SHOPIFY_SEO_OUTPUT_MODE")
+    print("   SHOPIFY_SEO_OUTPUT_COMPRESSION")
+    print("   SHOPIFY_SEO_CHECKPOINT_INTERVAL")
+    print("   SHOPIFY_SEO_CACHE_PATH")
+    print("   SHOPIFY_SEO_JOB_WORKERS")
+    print("   SHOPIFY_SEO_JOB_QUEUE_SIZE")
+    print("   SHOPIFY_SEO_JOB_STORE")
+    print("   SHOPIFY_SEO_JOB_STORE_PATH")
+    print("   SHOPIFY_SEO_JOB_TTL")
+    print("   SHOPIFY_SEO_JOB_STORE_MAX_JOBS")
+    print("   SHOPIFY_SEO_TEMP_MAX_AGE")
+    print("   SHOPIFY_SEO_TEMP_MAX_BYTES")
+    print("   SHOPIFY_SEO_CLEANUP_INTERVAL")
@@ -0,0 +1,156 @@
+"""
+Transparent gzip/zstd compression for CSV input and output.
+
+gzip support is built in; zstd needs the optional ``zstandard`` package
+(``pip install shopify-seo-tool[zstd]``).
+"""
+
+import io
+import gzip
+import zlib
+from typing import IO, Tuple, Callable, Optional
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - exercised only without zstandard
+    zstandard = None
+
+GZIP = "gzip"
+ZSTD = "zstd"
+
+# File suffix for each output compression
+SUFFIXES = {GZIP: ".gz", ZSTD: ".zst"}
+
+_MAGIC = {GZIP: b"\x1f\x8b", ZSTD: b"\x28\xb5\x2f\xfd"}
+
+
+def _require_zstandard() -> None:
+    if zstandard is None:
+        raise ImportError(
+            "zstd compression requires the zstandard package. "
+            "Install it with: pip install shopify-seo-tool[zstd]"
+        )
+
+
+def compression_for_path(path: str) -> Optional[str]:
+    """Return the compression implied by a file name's extension, or None."""
+    lowered = path.lower()
+    for compression, suffix in SUFFIXES.items():
+        if lowered.endswith(suffix):
+            return compression
+    return None
+
+
+def sniff(stream: IO[bytes]) -> Optional[str]:
+    """
+    Detect compression from a binary stream's magic bytes without consuming them.
+
+    Args:
+        stream: Binary stream at its start; must support peek() or seek()
+
+    Returns:
+        GZIP, ZSTD, or None for plain (or undetectable) input
+    """
+    if hasattr(stream, "peek"):
+        head = stream.peek(4)[:4]
+    elif getattr(stream, "seekable", lambda: False)():
+        position = stream.tell()
+        head = stream.read(4)
+        stream.seek(position)
+    else:
+        return None
+    for compression, magic in _MAGIC.items():
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def decompressing_reader(stream: IO[bytes], name: str = "") -> Tuple[IO[bytes], Callable[[], None]]:
+    """
+    Wrap a binary stream so compressed input is decompressed as it is read.
+
+    Compression is taken from the name's extension, or sniffed from the
+    stream's first bytes. The wrapped stream is never closed.
+
+    Args:
+        stream: Binary input stream
+        name: File name, if known
+
+    Returns:
+        Tuple of (binary_stream, release); plain input is returned as is
+    """
+    compression = compression_for_path(name) or sniff(stream)
+    if compression == GZIP:
+        reader = gzip.GzipFile(fileobj=stream, mode="rb")
+        return reader, reader.close
+    if compression == ZSTD:
+        _require_zstandard()
+        # The stream reader cannot readline(), which header parsing needs
+        reader = io.BufferedReader(
+            zstandard.ZstdDecompressor().stream_reader(stream, closefd=False)
+        )
+        return reader, reader.close
+    return stream, lambda: None
+
+
+class IncrementalDecompressor:
+    """
+    Decompress a gzip or zstd stream fed in arbitrary pieces.
+
+    Concatenated gzip members or zstd frames are decompressed in turn, as
+    the file readers do.
+    """
+
+    def __init__(self, compression: str):
+        """
+        Args:
+            compression: GZIP or ZSTD
+        """
+        if compression == GZIP:
+            self._new = lambda: zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif compression == ZSTD:
+            _require_zstandard()
+            self._new = lambda: zstandard.ZstdDecompressor().decompressobj()
+        else:
+            raise ValueError(f"Unknown compression '{compression}'. Expected 'gzip' or 'zstd'")
+        self._decompressor = self._new()
+
+    def decompress(self, data: bytes) -> bytes:
+        """Return the bytes decompressed from the next piece of input."""
+        output = []
+        while data:
+            output.append(self._decompressor.decompress(data))
+            if not self._decompressor.eof:
+                break
+            # The member ended; anything after it is the next member
+            data = self._decompressor.unused_data
+            self._decompressor = self._new()
+        return b"".join(output)
+
+
+def open_output(path: str, compression: Optional[str], binary: bool = False) -> IO:
+    """
+    Open an output file, compressing it on the fly when requested.
+
+    Args:
+        path: Output file path
+        compression: GZIP, ZSTD or None
+        binary: Open for bytes instead of UTF-8 text
+
+    Returns:
+        Writable file object
+    """
+    if compression == GZIP:
+        raw = gzip.open(path, "wb", compresslevel=6)
+    elif compression == ZSTD:
+        _require_zstandard()
+        raw = zstandard.open(path, "wb")
+    elif compression:
+        raise ValueError(f"Unknown compression '{compression}'. Expected 'gzip' or 'zstd'")
+    elif binary:
+        return open(path, "wb")
+    else:
+        return open(path, "w", encoding="utf-8", newline="")
+    if binary:
+        return raw
+    return io.TextIOWrapper(raw, encoding="utf-8", newline="")
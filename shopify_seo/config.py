@@ -4,6 +4,26 @@ Configuration management for Shopify SEO tool.
 
 import os
 from dataclasses import dataclass
+from typing import Optional, Union
+
+
+def parse_keep_alive(value: Optional[str]) -> Optional[Union[str, int]]:
+    """Parse a keep_alive setting: plain numbers are seconds, anything else a duration."""
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+
+def parse_size(value: str) -> int:
+    """Parse a byte size such as "500000", "512M" or "2G" (binary units)."""
+    value = value.strip().upper().rstrip("B")
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+    if value and value[-1] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(value)
 
 
 @dataclass
@@ -13,15 +33,56 @@ class Config:
     # AI Model Configuration
     model_name: str = "gpt-oss:latest"
     max_title_length: int = 53
+    backend: str = "ollama"  # "ollama" or "stub" (deterministic, no model needed)
+    endpoints: tuple = ()  # Ollama server URLs; empty uses the default host (OLLAMA_HOST)
+    endpoint_cooldown: float = 30.0  # Seconds a failed endpoint is out of rotation
+    stub_latency: float = 0.0  # Artificial seconds per request for the stub backend
+    stub_rule: str = "truncate"  # Stub output rule: "truncate", "echo" or "fail"
     
     # File Configuration
     temp_dir: str = "temp"
-    allowed_extensions: tuple = ('.csv',)
-    max_file_size: int = 16 * 1024 * 1024  # 16MB
+    allowed_extensions: tuple = ('.csv', '.csv.gz', '.csv.zst')
+    max_file_size: int = 1 << 30  # 1GB; uploads are streamed, so this bounds disk use, not memory
+    upload_spool_size: int = 8 << 20  # Upload bytes kept in memory before spilling to temp_dir
     
     # API Configuration
     api_timeout: int = 30
     max_retries: int = 3
+    retry_backoff: float = 1.0  # Seconds before the first retry, doubled each attempt
+    retry_backoff_max: float = 30.0
+    circuit_failure_threshold: int = 5  # Consecutive failures before failing fast
+    circuit_reset_timeout: float = 60.0  # Seconds before probing the model host again
+    keep_alive: Optional[Union[str, int]] = None  # e.g. "30m" or -1 to keep the model loaded
+    warm_up: bool = False  # Preload the model before processing
+    
+    # Processing Configuration
+    concurrency: int = 1  # Number of parallel model requests (1 = serial)
+    batch_size: int = 1  # Titles per model request (1 = one title per request)
+    structured_output: bool = False  # Ask the model for JSON matching a schema
+    num_predict: int = 128  # Token budget per title when structured_output is on
+    
+    chunk_size: int = 0  # Rows per chunk when streaming large files (0 = load whole file)
+    passthrough: bool = False  # Parse only working columns and copy the rest of each record verbatim
+    csv_engine: str = "pandas"  # "pandas" or "pyarrow" (multithreaded, needs the [arrow] extra)
+    output_mode: str = "full"  # "full" (every row and column) or "changes" (Handle + SEO Title of changed products)
+    output_compression: str = ""  # "", "gzip" or "zstd" (needs the [zstd] extra)
+    checkpoint_interval: int = 25  # Rewrites buffered between checkpoint journal flushes (0 = no journal)
+    
+    # Cache Configuration
+    cache_path: Optional[str] = None  # SQLite rewrite cache; None disables caching
+    
+    # Web App Job Queue Configuration
+    job_workers: int = 2  # Uploads processed at once
+    job_queue_size: int = 16  # Uploads allowed to wait for a worker
+    job_store: str = "memory"  # "memory" (this process only) or "sqlite" (shared between app processes)
+    job_store_path: Optional[str] = None  # SQLite job store; defaults to temp_dir/jobs.sqlite3
+    job_ttl: int = 86400  # Seconds finished jobs and their output files are kept (0 = no expiry)
+    job_store_max_jobs: int = 1000  # Finished jobs the memory store keeps before evicting the least recently used
+    
+    # Temp Directory Cleanup Configuration
+    temp_max_age: int = 86400  # Seconds before a temp file is deleted (0 = no age limit)
+    temp_max_bytes: int = 1 << 30  # Total size temp_dir is trimmed to, oldest files first (0 = no quota)
+    cleanup_interval: int = 300  # Seconds between web app cleanup sweeps (0 = no background cleanup)
     
     @classmethod
     def from_env(cls) -> 'Config':
@@ -29,7 +90,41 @@ class Config:
         return cls(
             model_name=os.getenv('SHOPIFY_SEO_MODEL', cls.model_name),
             max_title_length=int(os.getenv('SHOPIFY_SEO_MAX_TITLE_LENGTH', str(cls.max_title_length))),
+            backend=os.getenv('SHOPIFY_SEO_BACKEND', cls.backend),
+            endpoints=tuple(
+                url.strip() for url in os.getenv('SHOPIFY_SEO_ENDPOINTS', '').split(',') if url.strip()
+            ),
+            endpoint_cooldown=float(os.getenv('SHOPIFY_SEO_ENDPOINT_COOLDOWN', str(cls.endpoint_cooldown))),
+            stub_latency=float(os.getenv('SHOPIFY_SEO_STUB_LATENCY', str(cls.stub_latency))),
+            stub_rule=os.getenv('SHOPIFY_SEO_STUB_RULE', cls.stub_rule),
             temp_dir=os.getenv('SHOPIFY_SEO_TEMP_DIR', cls.temp_dir),
+            max_file_size=parse_size(os.getenv('SHOPIFY_SEO_MAX_FILE_SIZE', str(cls.max_file_size))),
+            upload_spool_size=parse_size(os.getenv('SHOPIFY_SEO_UPLOAD_SPOOL_SIZE', str(cls.upload_spool_size))),
             api_timeout=int(os.getenv('SHOPIFY_SEO_API_TIMEOUT', str(cls.api_timeout))),
-            max_retries=int(os.getenv('SHOPIFY_SEO_MAX_RETRIES', str(cls.max_retries)))
+            max_retries=int(os.getenv('SHOPIFY_SEO_MAX_RETRIES', str(cls.max_retries))),
+            retry_backoff=float(os.getenv('SHOPIFY_SEO_RETRY_BACKOFF', str(cls.retry_backoff))),
+            circuit_failure_threshold=int(os.getenv('SHOPIFY_SEO_CIRCUIT_THRESHOLD', str(cls.circuit_failure_threshold))),
+            circuit_reset_timeout=float(os.getenv('SHOPIFY_SEO_CIRCUIT_RESET', str(cls.circuit_reset_timeout))),
+            keep_alive=parse_keep_alive(os.getenv('SHOPIFY_SEO_KEEP_ALIVE')),
+            warm_up=os.getenv('SHOPIFY_SEO_WARM_UP', '').lower() in ('1', 'true', 'yes'),
+            concurrency=int(os.getenv('SHOPIFY_SEO_CONCURRENCY', str(cls.concurrency))),
+            batch_size=int(os.getenv('SHOPIFY_SEO_BATCH_SIZE', str(cls.batch_size))),
+            structured_output=os.getenv('SHOPIFY_SEO_STRUCTURED_OUTPUT', '').lower() in ('1', 'true', 'yes'),
+            num_predict=int(os.getenv('SHOPIFY_SEO_NUM_PREDICT', str(cls.num_predict))),
+            chunk_size=int(os.getenv('SHOPIFY_SEO_CHUNK_SIZE', str(cls.chunk_size))),
+            passthrough=os.getenv('SHOPIFY_SEO_PASSTHROUGH', '').lower() in ('1', 'true', 'yes'),
+            csv_engine=os.getenv('SHOPIFY_SEO_CSV_ENGINE', cls.csv_engine),
+            output_mode=os.getenv('SHOPIFY_SEO_OUTPUT_MODE', cls.output_mode),
+            output_compression=os.getenv('SHOPIFY_SEO_OUTPUT_COMPRESSION', cls.output_compression),
+            checkpoint_interval=int(os.getenv('SHOPIFY_SEO_CHECKPOINT_INTERVAL', str(cls.checkpoint_interval))),
+            cache_path=os.getenv('SHOPIFY_SEO_CACHE_PATH') or cls.cache_path,
+            job_workers=int(os.getenv('SHOPIFY_SEO_JOB_WORKERS', str(cls.job_workers))),
+            job_queue_size=int(os.getenv('SHOPIFY_SEO_JOB_QUEUE_SIZE', str(cls.job_queue_size))),
+            job_store=os.getenv('SHOPIFY_SEO_JOB_STORE', cls.job_store),
+            job_store_path=os.getenv('SHOPIFY_SEO_JOB_STORE_PATH') or cls.job_store_path,
+            job_ttl=int(os.getenv('SHOPIFY_SEO_JOB_TTL', str(cls.job_ttl))),
+            job_store_max_jobs=int(os.getenv('SHOPIFY_SEO_JOB_STORE_MAX_JOBS', str(cls.job_store_max_jobs))),
+            temp_max_age=int(os.getenv('SHOPIFY_SEO_TEMP_MAX_AGE', str(cls.temp_max_age))),
+            temp_max_bytes=parse_size(os.getenv('SHOPIFY_SEO_TEMP_MAX_BYTES', str(cls.temp_max_bytes))),
+            cleanup_interval=int(os.getenv('SHOPIFY_SEO_CLEANUP_INTERVAL', str(cls.cleanup_interval)))
         )
@@ -0,0 +1,299 @@
+"""
+Lightweight CSV input helpers for Shopify exports.
+
+Nothing in this module touches pandas, so header checks stay cheap even
+on very large files.
+"""
+
+import io
+import csv
+from typing import IO, List, Tuple, Union, Callable, Iterator, Optional
+
+from .compression import decompressing_reader
+
+# Columns every Shopify product export must provide
+REQUIRED_COLUMNS = ["Title", "Body (HTML)", "Status", "SEO Title", "SEO Description"]
+
+CsvSource = Union[str, IO]
+
+
+def open_binary(source: CsvSource) -> Tuple[IO[bytes], Callable[[], None]]:
+    """
+    Open a CSV source for binary reading.
+
+    gzip and zstd input is decompressed as it is read, detected from the
+    file extension or the leading magic bytes.
+
+    Args:
+        source: File path, or an already-open binary stream
+
+    Returns:
+        Tuple of (binary_stream, release); see open_text()
+
+    Raises:
+        TypeError: If source is a text stream
+    """
+    if isinstance(source, io.TextIOBase):
+        raise TypeError("A binary stream or file path is required")
+    if isinstance(source, str):
+        raw = open(source, "rb")
+        stream, release = decompressing_reader(raw, source)
+
+        def close() -> None:
+            release()
+            raw.close()
+        return stream, close
+    name = getattr(source, "name", "")
+    return decompressing_reader(source, name if isinstance(name, str) else "")
+
+
+def open_text(source: CsvSource, keep_bom: bool = False) -> Tuple[IO[str], Callable[[], None]]:
+    """
+    Open a CSV source for text reading.
+
+    Compressed input is decompressed transparently; see open_binary().
+
+    Args:
+        source: File path, or an already-open text or binary stream
+        keep_bom: Decode a leading byte-order mark as U+FEFF instead of
+            dropping it, so the input can be copied byte for byte
+
+    Returns:
+        Tuple of (text_stream, release). Call release() when done: it closes
+        files opened here and leaves caller-owned streams open.
+    """
+    if isinstance(source, io.TextIOBase):
+        return source, lambda: None
+    stream, release = open_binary(source)
+    text = io.TextIOWrapper(stream, encoding="utf-8" if keep_bom else "utf-8-sig", newline="")
+
+    def close() -> None:
+        # Detach so closing the wrapper never closes a caller's stream
+        text.detach()
+        release()
+    return text, close
+
+
+def read_header_binary(stream: IO[bytes]) -> List[str]:
+    """
+    Read the header record from a binary stream, leaving it at the first data row.
+
+    Args:
+        stream: Binary stream at the start of the CSV
+
+    Returns:
+        Column names
+
+    Raises:
+        ValueError: If the stream holds no header
+    """
+    lines: List[bytes] = []
+    while True:
+        line = stream.readline()
+        if not line:
+            break
+        lines.append(line)
+        # Keep reading while a quoted field is still open
+        if b"".join(lines).count(b'"') % 2 == 0:
+            if line.strip() or len(lines) > 1:
+                break
+            lines = []
+    text = b"".join(lines).decode("utf-8-sig")
+    return read_header(io.StringIO(text, newline=""))
+
+
+def read_header(stream: IO[str]) -> List[str]:
+    """
+    Read the header record, leaving the stream positioned at the first data row.
+
+    Args:
+        stream: Text stream at the start of the CSV
+
+    Returns:
+        Column names
+
+    Raises:
+        ValueError: If the stream holds no header
+    """
+    for record in csv.reader(stream):
+        if any(field.strip() for field in record):
+            return record
+        # Skip blank lines before the header, as pandas does
+    raise ValueError("No columns to parse from file")
+
+
+def read_raw_header(stream: IO[str]) -> Tuple[List[str], str]:
+    """
+    Read the header record unparsed, leaving the stream at the first data row.
+
+    Args:
+        stream: Text stream opened with newline=""; see open_text(keep_bom=True)
+
+    Returns:
+        Column names and the raw header record, line terminator and any
+        leading byte-order mark included
+
+    Raises:
+        ValueError: If the stream holds no header
+    """
+    bom = ""
+    for number, record in enumerate(iter_raw_records(stream)):
+        if number == 0 and record.startswith("\ufeff"):
+            bom, record = "\ufeff", record[1:]
+        columns = next(csv.reader(io.StringIO(record, newline="")), [])
+        if any(field.strip() for field in columns):
+            return columns, bom + record
+        # Skip blank lines before the header, as pandas does
+    raise ValueError("No columns to parse from file")
+
+
+def normalize_columns(columns: List[str]) -> List[str]:
+    """
+    Name columns the way pandas does for a header row.
+
+    Blank names become "Unnamed: <position>" and duplicates get a numeric
+    suffix ("X", "X.1", ...), so passing the result as names= gives the
+    same frame as letting pandas parse the header itself.
+    """
+    seen = set()
+    counts = {}
+    result = []
+    for position, name in enumerate(columns):
+        name = name or f"Unnamed: {position}"
+        candidate = name
+        while candidate in seen:
+            counts[name] = counts.get(name, 0) + 1
+            candidate = f"{name}.{counts[name]}"
+        seen.add(candidate)
+        result.append(candidate)
+    return result
+
+
+class RecordSplitter:
+    """
+    Groups CSV text into raw records without parsing fields.
+
+    A record ends at a line break outside quotes, so quoted fields with
+    embedded newlines (e.g. Body (HTML)) stay in one record. Records are
+    returned exactly as read, including their line terminator. Lines can be
+    added one at a time (as read from a stream opened with newline=""), or
+    text can be fed in arbitrary pieces, e.g. as an upload arrives.
+    """
+
+    def __init__(self):
+        self._lines: List[str] = []
+        self._quotes = 0
+        self._tail = ""  # Fed text after the last complete line
+
+    def add_line(self, line: str) -> Optional[str]:
+        """Add one line, returning the record it completes, if any."""
+        self._lines.append(line)
+        self._quotes += line.count('"')
+        # An odd number of quote characters means a quoted field is still open
+        if self._quotes % 2:
+            return None
+        record = "".join(self._lines)
+        self._lines = []
+        self._quotes = 0
+        return record
+
+    def feed(self, text: str) -> List[str]:
+        """
+        Add a piece of text, returning the records it completes.
+
+        Lines may end in LF, CRLF or a lone CR, as csv and pandas accept.
+        """
+        lines = io.StringIO(self._tail + text, newline="").readlines()
+        # The last line may go on in the next piece; a trailing "\r" may be half of "\r\n"
+        self._tail = lines.pop() if lines and not lines[-1].endswith("\n") else ""
+        records = []
+        for line in lines:
+            record = self.add_line(line)
+            if record is not None:
+                records.append(record)
+        return records
+
+    def finish(self) -> List[str]:
+        """Return the records left once all text has been added."""
+        records = []
+        if self._tail:
+            record = self.add_line(self._tail)
+            self._tail = ""
+            if record is not None:
+                records.append(record)
+        if self._lines:
+            records.append("".join(self._lines))
+            self._lines = []
+            self._quotes = 0
+        return records
+
+
+def iter_raw_records(stream: IO[str]) -> Iterator[str]:
+    """
+    Split a CSV text stream into raw records without parsing fields.
+
+    See RecordSplitter for how records are delimited.
+
+    Args:
+        stream: Text stream opened with newline=""
+
+    Yields:
+        Raw record strings
+    """
+    splitter = RecordSplitter()
+    for line in stream:
+        record = splitter.add_line(line)
+        if record is not None:
+            yield record
+    yield from splitter.finish()
+
+
+def split_terminator(record: str) -> Tuple[str, str]:
+    """Split a raw record into its body and line terminator ("\n" if it has none)."""
+    body = record.rstrip("\r\n")
+    return body, record[len(body):] or "\n"
+
+
+def quote_field(value: Optional[str]) -> str:
+    """Quote a single value for CSV output the way csv.QUOTE_MINIMAL (and pandas) would."""
+    if value is None:
+        return ""
+    if any(ch in value for ch in ',"\r\n'):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+def check_columns(columns: List[str]) -> Tuple[bool, str]:
+    """
+    Check that the required Shopify columns are present.
+
+    Args:
+        columns: Column names from the header
+
+    Returns:
+        Tuple of (is_valid, error_message)
+    """
+    missing_columns = [col for col in REQUIRED_COLUMNS if col not in columns]
+    if missing_columns:
+        return False, f"Missing required columns: {', '.join(missing_columns)}"
+    return True, ""
+
+
+def validate_header(source: CsvSource) -> Tuple[bool, str]:
+    """
+    Validate a CSV file by reading only its header record.
+
+    Args:
+        source: File path or open stream
+
+    Returns:
+        Tuple of (is_valid, error_message)
+    """
+    try:
+        stream, release = open_text(source)
+        try:
+            return check_columns(read_header(stream))
+        finally:
+            release()
+    except Exception as e:
+        return False, f"Error reading CSV file: {str(e)}"
@@ -0,0 +1,79 @@
+"""
+Incremental (delta) processing against a previous Shopify export.
+"""
+
+import csv
+import json
+import hashlib
+from typing import Dict, Optional
+
+from .csv_io import CsvSource, open_text, read_header
+
+
+def content_key(handle: Optional[str], title: str, description: Optional[str]) -> str:
+    """
+    Hash the fields that determine a product row's rewrite.
+
+    Whitespace is normalised the same way rewrite groups are, so formatting
+    noise between exports does not count as a change.
+
+    Args:
+        handle: Product handle
+        title: SEO Title
+        description: SEO Description
+
+    Returns:
+        Hex digest identifying the row's content
+    """
+    payload = json.dumps([
+        (handle or "").strip(),
+        " ".join(str(title).split()),
+        " ".join(str(description or "").split()),
+    ])
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def load_previous(source: CsvSource) -> Dict[str, str]:
+    """
+    Index the optimized output of a previous run by row content.
+
+    Args:
+        source: Path or stream of the previous optimized CSV
+
+    Returns:
+        Dict mapping content_key() to the row's "Edited Title"; rows without
+        one are left out
+
+    Raises:
+        ValueError: If the previous file lacks the SEO Title or Edited Title
+            column (a plain export has no rewritten titles to reuse)
+    """
+    stream, release = open_text(source)
+    try:
+        columns = read_header(stream)
+        if "SEO Title" not in columns:
+            raise ValueError("Previous export is missing the SEO Title column")
+        if "Edited Title" not in columns:
+            raise ValueError(
+                "Previous file has no Edited Title column; pass the optimized CSV "
+                "written by the previous run, not a plain export"
+            )
+        positions = {
+            name: columns.index(name) if name in columns else None
+            for name in ("Handle", "SEO Title", "SEO Description", "Edited Title")
+        }
+
+        def field(record, name):
+            pos = positions[name]
+            return record[pos] if pos is not None and pos < len(record) else ""
+
+        previous: Dict[str, str] = {}
+        for record in csv.reader(stream):
+            title = field(record, "SEO Title")
+            edited = field(record, "Edited Title")
+            if not title.strip() or not edited.strip():
+                continue
+            previous[content_key(field(record, "Handle"), title, field(record, "SEO Description"))] = edited
+        return previous
+    finally:
+        release()
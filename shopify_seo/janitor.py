@@ -0,0 +1,256 @@
+"""
+Age and disk-quota cleanup of the temp directory.
+"""
+
+import os
+import time
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Iterable, List, Optional, Set, Tuple
+
+# SQLite side files that belong to a protected database
+_SQLITE_SIDE_FILES = ("-wal", "-shm", "-journal")
+
+# Seconds between modification-time refreshes of held files, so temp
+# cleanup in other processes sees them as in use (keep below the grace period)
+TOUCH_INTERVAL = 60.0
+
+# Files in use in this process, counted per holder
+_held: Counter = Counter()
+_touched: Counter = Counter()
+_held_lock = threading.Lock()
+_toucher: Optional[threading.Thread] = None
+
+
+def hold_files(paths: Iterable[Optional[str]], touch: bool = True) -> None:
+    """
+    Mark files as in use, so no janitor deletes them until they are released.
+
+    Args:
+        paths: Files to hold (None entries are ignored); they need not exist yet
+        touch: Refresh their modification time every TOUCH_INTERVAL seconds,
+            which protects them from janitors in other processes
+    """
+    global _toucher
+    with _held_lock:
+        for path in paths:
+            if path:
+                path = os.path.abspath(path)
+                _held[path] += 1
+                if touch:
+                    _touched[path] += 1
+        if touch and _toucher is None:
+            _toucher = threading.Thread(target=_touch_held, name="shopify-seo-toucher", daemon=True)
+            _toucher.start()
+
+
+def release_files(paths: Iterable[Optional[str]], touch: bool = True) -> None:
+    """
+    Release files held with hold_files().
+
+    Args:
+        paths: Files to release
+        touch: The touch argument they were held with
+    """
+    with _held_lock:
+        for path in paths:
+            if path:
+                path = os.path.abspath(path)
+                for counts in (_held, _touched) if touch else (_held,):
+                    counts[path] -= 1
+                    if counts[path] <= 0:
+                        del counts[path]
+
+
+def files_in_use() -> Set[str]:
+    """Return the absolute paths of the files held in this process."""
+    with _held_lock:
+        return set(_held)
+
+
+def _touch_held() -> None:
+    while True:
+        time.sleep(TOUCH_INTERVAL)
+        with _held_lock:
+            paths = list(_touched)
+        for path in paths:
+            try:
+                os.utime(path)
+            except OSError:
+                pass  # Not created yet, or already gone
+
+
+@dataclass
+class SweepResult:
+    """Outcome of one pass over the temp directory."""
+
+    files_deleted: int = 0
+    bytes_reclaimed: int = 0
+    files_remaining: int = 0
+    bytes_remaining: int = 0
+
+    def to_dict(self) -> dict:
+        """Return the result as a JSON-serialisable dict."""
+        return {
+            "files_deleted": self.files_deleted,
+            "bytes_reclaimed": self.bytes_reclaimed,
+            "files_remaining": self.files_remaining,
+            "bytes_remaining": self.bytes_remaining,
+        }
+
+
+class TempJanitor:
+    """
+    Deletes old files from the temp directory, oldest first.
+
+    A sweep deletes files older than max_age, then, while the directory is
+    still over max_bytes, the oldest remaining files. Files of in-flight
+    jobs, files held with hold_files() (inputs, outputs and checkpoint
+    journals of running process_csv calls, and uploads of queued jobs),
+    protected paths (such as the rewrite cache and job store databases) and
+    files modified within the last grace seconds are never deleted. Held
+    files are touched every TOUCH_INTERVAL seconds, so the grace period
+    also covers those of other processes.
+    """
+
+    def __init__(
+        self,
+        temp_dir: str,
+        max_age: float = 0,
+        max_bytes: int = 0,
+        in_flight: Optional[Callable[[], Iterable[str]]] = None,
+        protected: Iterable[Optional[str]] = (),
+        grace: float = 300.0
+    ):
+        """
+        Create a janitor for a directory.
+
+        Args:
+            temp_dir: Directory to clean (recursively)
+            max_age: Seconds since last modification before a file is deleted (0 = no age limit)
+            max_bytes: Total size the directory is trimmed to (0 = no quota)
+            in_flight: Returns paths of files that in-flight jobs are using
+            protected: Paths that are never deleted, along with their SQLite side files
+            grace: Seconds since last modification during which a file is never deleted
+        """
+        self.temp_dir = temp_dir
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.in_flight = in_flight or (lambda: ())
+        self.grace = grace
+        self._protected: Set[str] = set()
+        for path in protected:
+            if path:
+                path = os.path.abspath(path)
+                self._protected.add(path)
+                self._protected.update(path + suffix for suffix in _SQLITE_SIDE_FILES)
+
+        # Cumulative metrics
+        self.sweeps = 0
+        self.files_deleted = 0
+        self.bytes_reclaimed = 0
+        self.last_sweep: Optional[float] = None
+        self.last_result = SweepResult()
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _scan(self) -> List[Tuple[float, int, str]]:
+        files = []
+        for root, _, names in os.walk(self.temp_dir):
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue  # Deleted while scanning
+                files.append((stat.st_mtime, stat.st_size, path))
+        files.sort()
+        return files
+
+    def sweep(self, dry_run: bool = False) -> SweepResult:
+        """
+        Enforce max_age and max_bytes once.
+
+        Args:
+            dry_run: Report what would be deleted without deleting it
+
+        Returns:
+            What was (or would be) deleted and what remains
+        """
+        with self._lock:
+            now = time.time()
+            keep = self._protected | files_in_use() | {os.path.abspath(path) for path in self.in_flight() if path}
+            files = self._scan()
+            total = sum(size for _, size, _ in files)
+            result = SweepResult()
+
+            for mtime, size, path in files:  # Oldest first
+                age = now - mtime
+                too_old = self.max_age > 0 and age > self.max_age
+                over_quota = self.max_bytes > 0 and total > self.max_bytes
+                if not (too_old or over_quota) or age < self.grace or os.path.abspath(path) in keep:
+                    continue
+                if not dry_run:
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        continue
+                total -= size
+                result.files_deleted += 1
+                result.bytes_reclaimed += size
+
+            result.files_remaining = len(files) - result.files_deleted
+            result.bytes_remaining = total
+            if not dry_run:
+                self.sweeps += 1
+                self.files_deleted += result.files_deleted
+                self.bytes_reclaimed += result.bytes_reclaimed
+                self.last_sweep = now
+                self.last_result = result
+            return result
+
+    def metrics(self) -> dict:
+        """Return cumulative cleanup metrics as a JSON-serialisable dict."""
+        with self._lock:
+            return {
+                "sweeps": self.sweeps,
+                "files_deleted": self.files_deleted,
+                "bytes_reclaimed": self.bytes_reclaimed,
+                "last_sweep": self.last_sweep,
+                "last_result": self.last_result.to_dict(),
+            }
+
+    def start(self, interval: float) -> None:
+        """
+        Sweep every interval seconds on a daemon thread.
+
+        Args:
+            interval: Seconds between sweeps
+        """
+        if self._thread is not None:
+            return
+        self._stop.clear()
+
+        def run() -> None:
+            while not self._stop.is_set():
+                try:
+                    result = self.sweep()
+                    if result.files_deleted:
+                        print(f"🧹 Cleaned {result.files_deleted} temp files "
+                              f"({result.bytes_reclaimed / 1024 / 1024:.1f} MB reclaimed)")
+                except Exception as e:
+                    print(f"⚠️  Temp cleanup failed: {e}")
+                self._stop.wait(interval)
+
+        self._thread = threading.Thread(target=run, name="shopify-seo-janitor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread started by start()."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
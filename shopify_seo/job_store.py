@@ -0,0 +1,277 @@
+"""
+Job stores for the web app's background job queue.
+
+The in-memory store keeps jobs in the serving process; the SQLite store
+lets several app processes sharing a temp directory serve status and
+downloads for each other's jobs. Both expire finished jobs after a TTL and
+delete their files with them.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Optional, Protocol, List, Set
+
+from .config import Config
+from .jobs import Job, DONE, FAILED
+
+# Minimum seconds between sweeps for expired jobs
+SWEEP_INTERVAL = 60.0
+
+# Seconds without an update after which a queued or running job in the
+# SQLite store is treated as abandoned (its process died)
+STALE_AFTER = 6 * 3600.0
+
+
+class JobStore(Protocol):
+    """Interface for job stores."""
+
+    def put(self, job: Job) -> None:
+        """Save the job's current state."""
+        ...
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return the job, or None if it is unknown or expired."""
+        ...
+
+    def delete(self, job_id: str) -> None:
+        """Forget a job without touching its files."""
+        ...
+
+    def evict_expired(self) -> int:
+        """Evict expired jobs and their files, returning how many were evicted."""
+        ...
+
+    def active_files(self) -> Set[str]:
+        """Return the input and output files of queued and running jobs."""
+        ...
+
+
+def _expired(job: Job, ttl: float, now: float) -> bool:
+    return ttl > 0 and job.finished and (job.finished_at or 0) + ttl <= now
+
+
+def _remove_files(job: Job) -> None:
+    for path in (job.output_file, job.input_file):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class MemoryJobStore:
+    """
+    Jobs held in this process, evicted by TTL and least-recent use.
+
+    Unfinished jobs are never evicted, so the store can exceed max_jobs
+    while that many are queued or running.
+    """
+
+    def __init__(self, ttl: float = 86400, max_jobs: int = 1000):
+        """
+        Create an empty store.
+
+        Args:
+            ttl: Seconds a finished job is kept (0 keeps it until it is the least recently used)
+            max_jobs: Jobs kept before the least recently used finished ones are evicted
+        """
+        self.ttl = ttl
+        self.max_jobs = max(1, max_jobs)
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._next_sweep = 0.0
+
+    def put(self, job: Job) -> None:
+        evicted: List[Job] = []
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._jobs.move_to_end(job.job_id)
+            if len(self._jobs) > self.max_jobs:
+                for old in list(self._jobs.values()):
+                    if len(self._jobs) <= self.max_jobs:
+                        break
+                    if old.finished:
+                        del self._jobs[old.job_id]
+                        evicted.append(old)
+        for old in evicted:
+            _remove_files(old)
+        if time.monotonic() >= self._next_sweep:
+            self.evict_expired()
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if not _expired(job, self.ttl, time.time()):
+                self._jobs.move_to_end(job_id)
+                return job
+            del self._jobs[job_id]
+        _remove_files(job)
+        return None
+
+    def delete(self, job_id: str) -> None:
+        with self._lock:
+            self._jobs.pop(job_id, None)
+
+    def evict_expired(self) -> int:
+        now = time.time()
+        with self._lock:
+            self._next_sweep = time.monotonic() + SWEEP_INTERVAL
+            expired = [job for job in self._jobs.values() if _expired(job, self.ttl, now)]
+            for job in expired:
+                del self._jobs[job.job_id]
+        for job in expired:
+            _remove_files(job)
+        return len(expired)
+
+    def active_files(self) -> Set[str]:
+        with self._lock:
+            return {
+                path
+                for job in self._jobs.values() if not job.finished
+                for path in (job.input_file, job.output_file)
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._jobs)
+
+
+class SQLiteJobStore:
+    """
+    Jobs kept in a SQLite database shared by every app process.
+
+    Each job is stored as its to_record() JSON. Output files must live on a
+    file system every process can read, such as a shared temp_dir. Queued
+    and running jobs not updated for stale_after seconds are evicted like
+    expired ones, so jobs of a crashed process do not linger.
+    """
+
+    def __init__(self, path: str, ttl: float = 86400, stale_after: float = STALE_AFTER):
+        """
+        Open (or create) the job database.
+
+        Args:
+            path: Path to the SQLite database file
+            ttl: Seconds a finished job is kept (0 keeps it forever)
+            stale_after: Seconds an unfinished job is kept without an update
+        """
+        self.path = path
+        self.ttl = ttl
+        self.stale_after = stale_after
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._next_sweep = 0.0
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " job_id TEXT PRIMARY KEY,"
+            " status TEXT NOT NULL,"
+            " expires_at REAL,"
+            " record TEXT NOT NULL"
+            ")"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_expires_at ON jobs (expires_at)")
+        self._conn.commit()
+
+    def _expires_at(self, job: Job) -> Optional[float]:
+        if not job.finished:
+            return time.time() + self.stale_after
+        if self.ttl > 0:
+            return (job.finished_at or time.time()) + self.ttl
+        return None
+
+    def put(self, job: Job) -> None:
+        record = json.dumps(job.to_record())
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO jobs (job_id, status, expires_at, record) VALUES (?, ?, ?, ?)",
+                (job.job_id, job.status, self._expires_at(job), record)
+            )
+            self._conn.commit()
+        if time.monotonic() >= self._next_sweep:
+            self.evict_expired()
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT expires_at, record FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        if row[0] is not None and row[0] <= time.time():
+            self.evict_expired()
+            return None
+        return Job.from_record(json.loads(row[1]))
+
+    def delete(self, job_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+            self._conn.commit()
+
+    def evict_expired(self) -> int:
+        now = time.time()
+        with self._lock:
+            self._next_sweep = time.monotonic() + SWEEP_INTERVAL
+            # Claim the rows in one write transaction, so only one process
+            # deletes each job's files (DELETE ... RETURNING needs SQLite 3.35)
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    "SELECT job_id, record FROM jobs WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                    (now,)
+                ).fetchall()
+                self._conn.executemany("DELETE FROM jobs WHERE job_id = ?", [(job_id,) for job_id, _ in rows])
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+        for _, record in rows:
+            _remove_files(Job.from_record(json.loads(record)))
+        return len(rows)
+
+    def active_files(self) -> Set[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT record FROM jobs WHERE status NOT IN (?, ?) AND expires_at > ?",
+                (DONE, FAILED, time.time())
+            ).fetchall()
+        files = set()
+        for (record,) in rows:
+            record = json.loads(record)
+            files.update(path for path in (record["input_file"], record["output_file"]) if path)
+        return files
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+
+def create_job_store(config: Config) -> JobStore:
+    """
+    Create the job store selected by Config.job_store.
+
+    Args:
+        config: Configuration object
+
+    Returns:
+        Job store instance
+
+    Raises:
+        ValueError: If the store name is not recognised
+    """
+    if config.job_store == "memory":
+        return MemoryJobStore(ttl=config.job_ttl, max_jobs=config.job_store_max_jobs)
+    if config.job_store == "sqlite":
+        path = config.job_store_path or os.path.join(config.temp_dir, "jobs.sqlite3")
+        return SQLiteJobStore(path, ttl=config.job_ttl)
+    raise ValueError(f"Unknown job store '{config.job_store}'. Expected 'memory' or 'sqlite'")
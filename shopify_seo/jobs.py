@@ -0,0 +1,335 @@
+"""
+Background job queue for processing uploads outside the request cycle.
+"""
+
+import io
+import os
+import time
+import uuid
+import queue
+import threading
+from collections import deque
+from dataclasses import dataclass, field, asdict
+from typing import Optional, Dict, Any, List, Deque, Tuple, TYPE_CHECKING
+
+from .processor import ShopifySEOProcessor, ProcessingResult
+from .janitor import hold_files, release_files
+from .progress import ProgressEvent
+
+if TYPE_CHECKING:
+    from .job_store import JobStore
+
+# Job lifecycle states
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# Rewrites kept per job for live progress displays
+RECENT_REWRITES = 10
+
+# Minimum seconds between progress writes to the job store
+STORE_INTERVAL = 1.0
+
+
+class QueueFullError(RuntimeError):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+
+@dataclass
+class Job:
+    """One uploaded file moving through the queue."""
+
+    job_id: str
+    filename: str
+    input_file: str
+    output_file: str
+    status: str = QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    progress: Optional[ProgressEvent] = None
+    result: Optional[ProcessingResult] = None
+    error: Optional[str] = None
+    candidate_rows: Optional[int] = None  # Counted while the upload streamed in
+    input_data: Optional[bytes] = field(default=None, repr=False)  # Small uploads kept in memory instead of input_file
+    recent: Deque[Dict[str, Any]] = field(default_factory=lambda: deque(maxlen=RECENT_REWRITES))
+    version: int = 0  # Bumped on every change, so listeners can wait for the next one
+    _changed: threading.Condition = field(default_factory=threading.Condition, repr=False, compare=False)
+
+    def record(self, event: ProgressEvent) -> None:
+        """Store a progress event (and its rewrite, if any) and wake listeners."""
+        with self._changed:
+            self.progress = event
+            if event.event == "rewrite":
+                self.recent.append({
+                    "original_title": event.original_title,
+                    "new_title": event.new_title,
+                    "source": event.source,
+                    "rows": event.rows,
+                })
+            self.notify()
+
+    def notify(self) -> None:
+        """Wake listeners after the job's state changed."""
+        with self._changed:
+            self.version += 1
+            self._changed.notify_all()
+
+    def wait_for_change(self, version: int, timeout: float) -> bool:
+        """
+        Block until the job changes after the given version.
+
+        Args:
+            version: Last version the caller has seen
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if the job changed, False on timeout
+        """
+        with self._changed:
+            return self._changed.wait_for(lambda: self.version != version, timeout)
+
+    def snapshot(self) -> Tuple[int, Dict[str, Any]]:
+        """Return the current version and state together."""
+        with self._changed:
+            return self.version, self.to_dict()
+
+    @property
+    def finished(self) -> bool:
+        """Whether the job has reached a final state."""
+        return self.status in (DONE, FAILED)
+
+    def to_record(self) -> Dict[str, Any]:
+        """Return everything needed to rebuild the job, as a JSON-serialisable dict."""
+        with self._changed:
+            return {
+                "job_id": self.job_id,
+                "filename": self.filename,
+                "input_file": self.input_file,
+                "output_file": self.output_file,
+                "status": self.status,
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "progress": asdict(self.progress) if self.progress else None,
+                "result": asdict(self.result) if self.result else None,
+                "error": self.error,
+                "candidate_rows": self.candidate_rows,
+                "recent": list(self.recent),
+                "version": self.version,
+            }
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> "Job":
+        """Rebuild a job saved with to_record()."""
+        record = dict(record)
+        progress = record.pop("progress")
+        result = record.pop("result")
+        recent = record.pop("recent")
+        return cls(
+            progress=ProgressEvent(**progress) if progress else None,
+            result=ProcessingResult(**result) if result else None,
+            recent=deque(recent, maxlen=RECENT_REWRITES),
+            **record
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the job's state as a JSON-serialisable dict."""
+        with self._changed:
+            return {
+                "job_id": self.job_id,
+                "filename": self.filename,
+                "status": self.status,
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "progress": self.progress.to_dict() if self.progress else None,
+                "candidate_rows": self.candidate_rows,
+                "recent_rewrites": list(self.recent),
+                "error": self.error,
+            }
+
+
+class JobManager:
+    """
+    Runs processing jobs on a fixed pool of worker threads.
+
+    All workers share one ShopifySEOProcessor, so its backend, cache and
+    Config.concurrency budget are shared across jobs. Submissions beyond
+    queue_size waiting jobs are rejected rather than buffered without bound.
+
+    Job state is kept in a JobStore. Jobs this manager is running are also
+    held in memory, so their listeners are woken on every change; other
+    jobs (e.g. run by another process sharing a SQLite store) are read
+    from the store.
+    """
+
+    def __init__(
+        self,
+        processor: ShopifySEOProcessor,
+        workers: int = 2,
+        queue_size: int = 16,
+        store: Optional["JobStore"] = None
+    ):
+        """
+        Start the worker threads.
+
+        Args:
+            processor: Processor shared by every job
+            workers: Jobs processed at once
+            queue_size: Jobs allowed to wait for a worker
+            store: Where job state is kept; defaults to an in-memory store
+        """
+        if store is None:
+            from .job_store import MemoryJobStore
+            store = MemoryJobStore()
+        self.processor = processor
+        self.store = store
+        self._queue: "queue.Queue[Job]" = queue.Queue(maxsize=max(1, queue_size))
+        self._live: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._workers: List[threading.Thread] = []
+        for number in range(max(1, workers)):
+            worker = threading.Thread(target=self._work, name=f"shopify-seo-job-{number}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def submit(
+        self,
+        input_file: str,
+        output_file: str,
+        filename: str,
+        input_data: Optional[bytes] = None,
+        candidate_rows: Optional[int] = None
+    ) -> Job:
+        """
+        Queue a file for processing.
+
+        Args:
+            input_file: Path of the saved upload ("" with input_data); deleted once the job ends
+            output_file: Where to write the optimised CSV
+            filename: Original file name, for display and downloads
+            input_data: Upload bytes to process instead of input_file
+            candidate_rows: Rewrite candidates, if already counted
+
+        Returns:
+            The queued job
+
+        Raises:
+            QueueFullError: If queue_size jobs are already waiting
+        """
+        job = Job(
+            job_id=str(uuid.uuid4()),
+            filename=filename,
+            input_file=input_file,
+            output_file=output_file,
+            candidate_rows=candidate_rows,
+            input_data=input_data
+        )
+        with self._lock:
+            self._live[job.job_id] = job
+        # Held (and touched) until the job ends, so temp cleanup in any
+        # process leaves a queued upload alone
+        hold_files([job.input_file, job.output_file])
+        self.store.put(job)
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            release_files([job.input_file, job.output_file])
+            with self._lock:
+                del self._live[job.job_id]
+            self.store.delete(job.job_id)
+            raise QueueFullError("Too many jobs are waiting; try again later")
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return the job with this id, or None if it is unknown or expired."""
+        with self._lock:
+            job = self._live.get(job_id)
+        return job or self.store.get(job_id)
+
+    def wait_for_change(self, job_id: str, version: int, timeout: float, poll_interval: float = 1.0) -> Optional[Job]:
+        """
+        Wait until a job changes after the given version.
+
+        Jobs run by this manager wake the caller immediately; others are
+        polled from the store.
+
+        Args:
+            job_id: Job to watch
+            version: Last version the caller has seen
+            timeout: Maximum seconds to wait
+            poll_interval: Seconds between store reads for other processes' jobs
+
+        Returns:
+            The changed job, or None on timeout or if the job is gone
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                live = self._live.get(job_id)
+            if live is not None:
+                if live.wait_for_change(version, max(0.0, deadline - time.monotonic())):
+                    return live
+                return None
+            job = self.store.get(job_id)
+            if job is None:
+                return None
+            if job.version != version:
+                return job
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            time.sleep(min(poll_interval, remaining))
+
+    def queued(self) -> int:
+        """Number of jobs waiting for a worker."""
+        return self._queue.qsize()
+
+    def _work(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                self._run(job)
+            finally:
+                self._queue.task_done()
+
+    def _run(self, job: Job) -> None:
+        job.status = RUNNING
+        job.started_at = time.time()
+        job.notify()
+        self.store.put(job)
+        last_saved = time.monotonic()
+
+        def on_progress(event: ProgressEvent) -> None:
+            nonlocal last_saved
+            job.record(event)
+            # Listeners in this process are woken directly; the store only
+            # needs to be current enough for other processes to poll
+            if time.monotonic() - last_saved >= STORE_INTERVAL:
+                last_saved = time.monotonic()
+                self.store.put(job)
+
+        source = io.BytesIO(job.input_data) if job.input_data is not None else job.input_file
+        try:
+            result = self.processor.process_csv(source, job.output_file, progress_callback=on_progress)
+            job.result = result
+            job.error = result.error_message
+            job.status = DONE if result.success else FAILED
+        except Exception as e:
+            job.error = str(e)
+            job.status = FAILED
+        finally:
+            job.finished_at = time.time()
+            job.input_data = None
+            if job.input_file:
+                try:
+                    os.remove(job.input_file)
+                except OSError:
+                    pass
+            release_files([job.input_file, job.output_file])
+            job.notify()
+            self.store.put(job)
+            with self._lock:
+                del self._live[job.job_id]
@@ -0,0 +1,140 @@
+"""
+Crash-safe checkpoint journal for Shopify SEO processing.
+"""
+
+import os
+import json
+import hashlib
+import threading
+from typing import Dict, List, Tuple, Optional
+
+from .janitor import hold_files, release_files
+
+# Normalised (SEO Title, SEO Description) pair identifying the rows a rewrite applies to
+GroupKey = Tuple[str, str]
+
+
+def input_fingerprint(file_path: str, settings: str, block_size: int = 1 << 20) -> str:
+    """
+    Hash an input file together with the settings that shape its rewrites.
+
+    Args:
+        file_path: Path to the input CSV
+        settings: Anything else that changes the output (model, length limit, prompt)
+        block_size: Bytes read per step
+
+    Returns:
+        Hex digest identifying the job
+    """
+    digest = hashlib.sha256(settings.encode("utf-8"))
+    with open(file_path, "rb") as fh:
+        for block in iter(lambda: fh.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class CheckpointJournal:
+    """
+    Append-only JSON-lines journal of completed rewrites.
+
+    Each line records one rewrite group and its title. Entries are buffered
+    and flushed (and fsynced) every flush_every entries, so a crash loses at
+    most that many rewrites. A torn final line from a crash mid-write is
+    ignored when the journal is loaded.
+    """
+
+    def __init__(self, path: str, flush_every: int = 25, resume: bool = False):
+        """
+        Open the journal.
+
+        Args:
+            path: Journal file path
+            flush_every: Entries buffered between flushes
+            resume: Keep and load existing entries; otherwise start afresh
+        """
+        self.path = path
+        self.flush_every = max(1, flush_every)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.entries: Dict[GroupKey, str] = self._load() if resume else {}
+        self._lock = threading.Lock()
+        self._pending: List[str] = []
+        self._file = open(path, "a" if resume else "w", encoding="utf-8")
+        # Keep temp cleanup away from the journal while it is open
+        hold_files([path])
+
+    def _load(self) -> Dict[GroupKey, str]:
+        entries: Dict[GroupKey, str] = {}
+        if not os.path.exists(self.path):
+            return entries
+        with open(self.path, "r", encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    record = json.loads(line)
+                    entries[(record["title"], record["description"])] = record["new_title"]
+                except (ValueError, KeyError, TypeError):
+                    # Torn write from a crash; everything before it is intact
+                    continue
+        return entries
+
+    def record(self, key: GroupKey, new_title: str) -> None:
+        """Append a completed rewrite, flushing once enough entries are buffered."""
+        line = json.dumps({"title": key[0], "description": key[1], "new_title": new_title})
+        with self._lock:
+            self.entries[key] = new_title
+            self._pending.append(line + "\n")
+            if len(self._pending) >= self.flush_every:
+                self._flush()
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        self._file.write("".join(self._pending))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = []
+
+    def close(self) -> None:
+        """Flush buffered entries and close the file."""
+        with self._lock:
+            if self._file.closed:
+                return
+            self._flush()
+            self._file.close()
+        release_files([self.path])
+
+    def discard(self) -> None:
+        """Close and delete the journal once the job has completed."""
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+def open_journal(
+    temp_dir: str,
+    input_file: str,
+    settings: str,
+    flush_every: int,
+    resume: bool
+) -> Optional[CheckpointJournal]:
+    """
+    Open the checkpoint journal for an input file.
+
+    Args:
+        temp_dir: Directory holding the checkpoints/ folder
+        input_file: Path to the input CSV
+        settings: Settings fingerprint; see input_fingerprint()
+        flush_every: Entries buffered between flushes (0 disables journaling)
+        resume: Whether to reload a previous journal for the same input
+
+    Returns:
+        The journal, or None when journaling is disabled
+    """
+    if flush_every <= 0:
+        return None
+    name = input_fingerprint(input_file, settings)[:32] + ".jsonl"
+    return CheckpointJournal(os.path.join(temp_dir, "checkpoints", name), flush_every, resume)
@@ -2,16 +2,84 @@
 Main processor class for Shopify SEO optimisation.
 """
 
+import io
 import re
+import csv
 import json
+import hashlib
 import pandas as pd
 import ollama
 import time
 import os
-from typing import Optional, Dict, Any, Tuple
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, Dict, Any, Tuple, List, Callable, IO, Iterator
 from dataclasses import dataclass
 
 from .config import Config
+from .cache import RewriteCache
+from .backends import RewriteBackend, create_backend
+from .resilience import CircuitBreaker, call_with_retries
+from .progress import ProgressTracker, ProgressEvent, ProgressCallback, print_progress
+from .journal import CheckpointJournal, open_journal
+from .janitor import hold_files, release_files
+from .delta import content_key, load_previous
+from .csv_io import (
+    CsvSource,
+    open_text,
+    open_binary,
+    read_header,
+    read_header_binary,
+    read_raw_header,
+    normalize_columns,
+    check_columns,
+    validate_header,
+    iter_raw_records,
+    split_terminator,
+    quote_field,
+)
+from . import arrow_io
+from .compression import SUFFIXES, compression_for_path, open_output
+
+# Columns parsed in passthrough mode; everything else is copied verbatim
+PROJECTED_COLUMNS = ["Handle", "Status", "SEO Title", "SEO Description"]
+
+# Where a rewritten title came from
+SOURCE_CACHE = "cache"
+SOURCE_MODEL = "model"
+SOURCE_FALLBACK = "fallback"
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Client errors such as an unknown model will not succeed on retry."""
+    if isinstance(error, ollama.ResponseError) and 400 <= error.status_code < 500:
+        return False
+    return True
+
+
+def candidate_mask(status: pd.Series, titles: pd.Series, max_title_length: int) -> pd.Series:
+    """
+    Select the rows whose SEO Title needs rewriting.
+    
+    A row is a candidate when its status is active and its SEO Title is
+    non-blank and longer than the maximum title length.
+    
+    Args:
+        status: Status column
+        titles: SEO Title column, aligned with status
+        max_title_length: Maximum title length
+        
+    Returns:
+        Boolean Series aligned with the inputs
+    """
+    status = status.str.strip().str.lower()
+    return (
+        (status == "active")
+        & titles.notna()
+        & (titles.str.strip() != "")
+        & (titles.str.len() > max_title_length)
+    ).fillna(False).astype(bool)
+
 
 @dataclass
 class ProcessingResult:
@@ -24,6 +92,20 @@ class ProcessingResult:
     processing_time: float
     success: bool
     error_message: Optional[str] = None
+    warmup_time: float = 0.0
+    cache_hits: int = 0
+    failed_rewrites: int = 0
+    rewrite_candidates: int = 0
+    rewrite_groups: int = 0
+    resumed_rewrites: int = 0
+    unchanged_rows: int = 0
+    
+    @property
+    def dedup_ratio(self) -> float:
+        """Candidate rows per unique rewrite (1.0 means no duplicates)."""
+        if not self.rewrite_groups:
+            return 1.0
+        return self.rewrite_candidates / self.rewrite_groups
 
 
 class ShopifySEOProcessor:
@@ -31,16 +113,34 @@ class ShopifySEOProcessor:
     Main processor class for optimising Shopify product titles using AI.
     """
     
-    def __init__(self, config: Optional[Config] = None):
+    def __init__(self, config: Optional[Config] = None, backend: Optional[RewriteBackend] = None):
         """
         Initialize the processor with configuration.
         
         Args:
             config: Configuration object. If None, uses default config.
+            backend: Rewrite backend. If None, one is created from config.backend.
         """
         self.config = config or Config()
         self._ensure_temp_dir()
         
+        # Model backend, and a circuit breaker shared by all requests
+        self.backend: RewriteBackend = backend or create_backend(self.config)
+        self.breaker = CircuitBreaker(
+            failure_threshold=self.config.circuit_failure_threshold,
+            reset_timeout=self.config.circuit_reset_timeout
+        )
+        
+        # Set once the model has been preloaded by warm_up()
+        self._warmed_up = False
+        
+        # Shared pool for concurrent model requests, created on first use
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        
+        # Caps model requests in flight across every file this processor handles
+        self._model_slots = threading.BoundedSemaphore(max(1, self.config.concurrency))
+        
         # System instructions for the AI model
         self.system_instructions = f"""
         You are an e-commerce SEO expert.
@@ -53,11 +153,71 @@ class ShopifySEOProcessor:
         - Do NOT end the title with any punctuation or symbols like &, ,, ;, :, ., !, ?, etc.
         - Ensure the title is complete, readable, and focuses on the most important product information.
         """
+        
+        # System instructions for batched rewrites (several titles per request)
+        self.batch_instructions = f"""
+        You are an e-commerce SEO expert.
+        Rewrite each provided Shopify product title so it is concise, descriptive, SEO-friendly, and NO LONGER than {self.config.max_title_length} characters.
+
+        OUTPUT RULES (very important):
+        - Output ONLY a JSON array of strings: one rewritten title per input title, in the same order. No explanation, no labels, no code fences.
+        - The array must contain exactly as many titles as were provided.
+        - If you cannot include the entire meaning, prioritize main product keywords (brand optional), not minor details such as size, color, or quantity.
+        - Do NOT end a title with meaningless or hanging words such as 'and', 'with', 'for', 'of', etc.
+        - Do NOT end a title with any punctuation or symbols like &, ,, ;, :, ., !, ?, etc.
+        - Ensure each title is complete, readable, and focuses on the most important product information.
+        """
+        
+        # Identifies the prompt version so cached rewrites are invalidated when it changes
+        self.prompt_fingerprint = hashlib.sha256(
+            self.system_instructions.encode("utf-8")
+        ).hexdigest()[:16]
+        
+        self.cache: Optional[RewriteCache] = (
+            RewriteCache(self.config.cache_path) if self.config.cache_path else None
+        )
     
     def _ensure_temp_dir(self) -> None:
         """Ensure the temporary directory exists."""
         os.makedirs(self.config.temp_dir, exist_ok=True)
     
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Return the shared thread pool used for concurrent model requests."""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=max(1, self.config.concurrency),
+                    thread_name_prefix="shopify-seo-rewrite"
+                )
+            return self._executor
+    
+    def warm_up(self) -> float:
+        """
+        Preload the configured model so the first rewrite does not pay the load cost.
+        
+        Returns:
+            Seconds spent loading the model
+        """
+        start = time.time()
+        try:
+            self.backend.warm_up()
+            self._warmed_up = True
+        except Exception as e:
+            print(f"⚠️ Could not warm up model '{self.config.model_name}': {e}")
+        elapsed = time.time() - start
+        print(f"🔥 Model warm-up took {elapsed:.1f}s")
+        return elapsed
+
+    def close(self) -> None:
+        """Release the worker pool held by the processor."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+        if self.cache is not None:
+            self.cache.close()
+            self.cache = None
+    
     def _extract_title_from_model_output(self, content: str) -> str:
         """
         Robust extraction of title from AI model output.
@@ -129,168 +289,850 @@ class ShopifySEOProcessor:
         
         return trimmed.strip()
 
-    def _rewrite_title(self, title: str, description: str) -> str:
+    def _chat(
+        self,
+        system: str,
+        prompt: str,
+        format: Optional[Dict[str, Any]] = None,
+        options: Optional[Dict[str, Any]] = None
+    ) -> str:
         """
-        Rewrite a product title using AI.
+        Send a system/user prompt pair to the AI model.
+        
+        Each attempt is bounded by Config.api_timeout; failures are retried
+        up to Config.max_retries times with jittered exponential backoff, and
+        the shared circuit breaker rejects calls outright while the model
+        host is failing. At most Config.concurrency attempts run at once,
+        however many files are being processed.
+        
+        Args:
+            system: System instructions
+            prompt: User prompt
+            format: Optional JSON schema the response must follow
+            options: Optional model options such as num_predict
+            
+        Returns:
+            Raw content of the model response
+            
+        Raises:
+            CircuitOpenError: If the circuit breaker is open
+            Exception: The last model client error once retries are exhausted
+        """
+        def attempt() -> str:
+            with self._model_slots:
+                return self.backend.chat(system, prompt, format=format, options=options)
+
+        return call_with_retries(
+            attempt,
+            max_retries=self.config.max_retries,
+            backoff=self.config.retry_backoff,
+            backoff_max=self.config.retry_backoff_max,
+            breaker=self.breaker,
+            is_retryable=_is_retryable
+        )
+
+    def _cache_key(self, title: str, description: str) -> str:
+        """Build the rewrite cache key for a title/description pair."""
+        return RewriteCache.make_key(
+            title,
+            description,
+            self.config.model_name,
+            self.config.max_title_length,
+            self.prompt_fingerprint
+        )
+
+    def _generate_title(self, title: str, description: str) -> str:
+        """
+        Ask the AI model for a rewritten title.
         
         Args:
             title: Original product title
             description: Product description
             
         Returns:
-            Rewritten title
+            Rewritten title, or an empty string if nothing usable was returned
+            
+        Raises:
+            Exception: Any error raised by the model client
         """
         prompt = f"""Original Title: {title}
         Product Description: {description}
         New Title (<= {self.config.max_title_length} chars):"""
-        
-        try:
-            response = ollama.chat(
-                model=self.config.model_name,
-                messages=[
-                    {"role": "system", "content": self.system_instructions},
-                    {"role": "user", "content": prompt}
-                ]
-            )
 
-            content = response.get("message", {}).get("content", "")
+        if not self.config.structured_output:
+            content = self._chat(self.system_instructions, prompt)
             extracted = self._extract_title_from_model_output(content)
-            final_title = self._enforce_length(extracted)
+            return self._enforce_length(extracted)
 
-            # Final safety: if extraction failed, fallback to original truncated
-            if not final_title:
-                final_title = self._enforce_length(title)
+        schema = {
+            "type": "object",
+            "properties": {
+                "title": {"type": "string", "maxLength": self.config.max_title_length}
+            },
+            "required": ["title"]
+        }
+        content = self._chat(
+            self.system_instructions,
+            prompt + '\n        Respond as JSON: {"title": "<new title>"}',
+            format=schema,
+            options={"num_predict": self.config.num_predict}
+        )
+        try:
+            parsed = json.loads(content)
+        except (json.JSONDecodeError, ValueError):
+            return ""
+        new_title = parsed.get("title") if isinstance(parsed, dict) else None
+        return self._enforce_length(new_title) if isinstance(new_title, str) else ""
 
-            return final_title
+    def _rewrite_title(self, title: str, description: str) -> str:
+        """
+        Rewrite a product title using AI.
+        
+        Args:
+            title: Original product title
+            description: Product description
+            
+        Returns:
+            Rewritten title
+        """
+        return self._resolve_title(title, description)[0]
 
+    def _resolve_title(self, title: str, description: str) -> Tuple[str, str]:
+        """
+        Rewrite a product title and report where the result came from.
+        
+        Successful rewrites are stored in the rewrite cache when one is
+        configured; fallbacks are not, so they are retried on the next run.
+        
+        Args:
+            title: Original product title
+            description: Product description
+            
+        Returns:
+            Tuple of (new_title, source) where source is SOURCE_MODEL or
+            SOURCE_FALLBACK
+        """
+        try:
+            final_title = self._generate_title(title, description)
         except Exception as e:
             print(f"⚠️ Ollama error for title '{title}': {e}")
             # fallback: truncated original title
-            return self._enforce_length(title)
+            return self._enforce_length(title), SOURCE_FALLBACK
+
+        # Final safety: if extraction failed, fallback to original truncated
+        if not final_title:
+            return self._enforce_length(title), SOURCE_FALLBACK
 
-    def validate_csv(self, file_path: str) -> Tuple[bool, str]:
+        if self.cache is not None:
+            self.cache.set(self._cache_key(title, description), final_title)
+
+        return final_title, SOURCE_MODEL
+
+    def _extract_titles_from_batch_output(self, content: str, count: int) -> List[Optional[str]]:
         """
-        Validate that the CSV file has the required columns.
+        Extract per-item titles from a batched model response.
         
         Args:
-            file_path: Path to the CSV file
+            content: Raw content from the AI model, expected to hold a JSON array
+            count: Number of titles that were requested
             
         Returns:
-            Tuple of (is_valid, error_message)
+            List of length count; items that are missing or invalid are None
         """
+        invalid: List[Optional[str]] = [None] * count
+        match = re.search(r'\[.*\]', content or "", flags=re.S)
+        if not match:
+            return invalid
         try:
-            df = pd.read_csv(file_path, dtype=str, nrows=1)
-            required_columns = ["Title", "Body (HTML)", "Status", "SEO Title", "SEO Description"]
+            parsed = json.loads(match.group())
+        except (json.JSONDecodeError, ValueError):
+            return invalid
+
+        return self._validate_batch_titles(parsed, count)
+
+    def _validate_batch_titles(self, parsed: Any, count: int) -> List[Optional[str]]:
+        """
+        Validate a decoded batch of titles item by item.
+        
+        Args:
+            parsed: Decoded JSON value, expected to be a list of titles
+            count: Number of titles that were requested
             
-            missing_columns = [col for col in required_columns if col not in df.columns]
+        Returns:
+            List of length count; items that are missing or invalid are None
+        """
+        # Without one entry per title the index mapping cannot be trusted
+        if not isinstance(parsed, list) or len(parsed) != count:
+            return [None] * count
+
+        titles: List[Optional[str]] = []
+        for item in parsed:
+            if isinstance(item, dict):
+                item = item.get("title") or item.get("new_title")
+            if isinstance(item, str) and item.strip():
+                titles.append(self._enforce_length(item.strip(' "\'')) or None)
+            else:
+                titles.append(None)
+        return titles
+
+    def _generate_titles_batch(self, items: List[Tuple[str, str]]) -> List[Optional[str]]:
+        """
+        Ask the AI model to rewrite several titles in a single request.
+        
+        Args:
+            items: List of (title, description) pairs
             
-            if missing_columns:
-                return False, f"Missing required columns: {', '.join(missing_columns)}"
+        Returns:
+            Rewritten titles in input order; None where the response was unusable
             
-            return True, ""
+        Raises:
+            Exception: Any error raised by the model client
+        """
+        entries = "\n".join(
+            f"{n}. Original Title: {title}\n   Product Description: {desc}"
+            for n, (title, desc) in enumerate(items, start=1)
+        )
+        prompt = f"""Rewrite these {len(items)} product titles (each <= {self.config.max_title_length} chars).
+        {entries}
+        Return a JSON array of exactly {len(items)} new titles:"""
+
+        if not self.config.structured_output:
+            content = self._chat(self.batch_instructions, prompt)
+            return self._extract_titles_from_batch_output(content, len(items))
+
+        schema = {
+            "type": "object",
+            "properties": {
+                "titles": {
+                    "type": "array",
+                    "items": {"type": "string", "maxLength": self.config.max_title_length},
+                    "minItems": len(items),
+                    "maxItems": len(items)
+                }
+            },
+            "required": ["titles"]
+        }
+        content = self._chat(
+            self.batch_instructions,
+            prompt + '\n        Respond as JSON: {"titles": ["<new title>", ...]}',
+            format=schema,
+            options={"num_predict": self.config.num_predict * len(items)}
+        )
+        try:
+            parsed = json.loads(content)
+        except (json.JSONDecodeError, ValueError):
+            return [None] * len(items)
+        titles = parsed.get("titles") if isinstance(parsed, dict) else None
+        return self._validate_batch_titles(titles, len(items))
+
+    def _rewrite_batch(self, items: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        """
+        Rewrite a batch of titles with one model request.
+        
+        Items the batched response does not cover fall back to the
+        single-title path.
+        
+        Args:
+            items: List of (title, description) pairs
             
+        Returns:
+            (new_title, source) tuples in input order
+        """
+        try:
+            titles = self._generate_titles_batch(items)
         except Exception as e:
-            return False, f"Error reading CSV file: {str(e)}"
+            print(f"⚠️ Ollama batch error for {len(items)} titles: {e}")
+            titles = [None] * len(items)
 
-    def process_csv(self, input_file: str, output_file: Optional[str] = None) -> ProcessingResult:
+        results: List[Tuple[str, str]] = []
+        for (title, desc), new_t in zip(items, titles):
+            if new_t is None:
+                results.append(self._resolve_title(title, desc))
+                continue
+            if self.cache is not None:
+                self.cache.set(self._cache_key(title, desc), new_t)
+            results.append((new_t, SOURCE_MODEL))
+        return results
+
+    def _rewrite_titles(
+        self,
+        items: List[Tuple[str, str]],
+        on_result: Optional[Callable[[int, str, str], None]] = None,
+        on_start: Optional[Callable[[int], None]] = None
+    ) -> List[str]:
         """
-        Process a Shopify CSV file to optimize product titles.
+        Rewrite several titles, concurrently and/or batched when configured.
+        
+        Titles found in the rewrite cache are resolved without a model call.
+        With Config.batch_size > 1 the remaining titles are sent to the model
+        in groups of that size.
         
         Args:
-            input_file: Path to input CSV file
-            output_file: Path to output CSV file. If None, generates automatically.
+            items: List of (title, description) pairs
+            on_result: Optional callback invoked as on_result(index, new_title, source)
+                from the calling thread as each rewrite completes, where source
+                is one of SOURCE_CACHE, SOURCE_MODEL or SOURCE_FALLBACK
+            on_start: Optional callback invoked as on_start(count) from the worker
+                thread when a request for count titles is about to be sent
             
         Returns:
-            ProcessingResult object with processing statistics
+            Rewritten titles in the same order as items
         """
-        start_time = time.time()
+        results: List[str] = [""] * len(items)
+        pending: List[int] = []
+
+        for i, (title, desc) in enumerate(items):
+            cached = self.cache.get(self._cache_key(title, desc)) if self.cache is not None else None
+            if cached is None:
+                pending.append(i)
+                continue
+            results[i] = cached
+            if on_result:
+                on_result(i, cached, SOURCE_CACHE)
+
+        batch_size = max(1, self.config.batch_size)
+        units = [pending[k:k + batch_size] for k in range(0, len(pending), batch_size)]
+
+        def run_unit(unit: List[int]) -> List[Tuple[str, str]]:
+            if on_start:
+                on_start(len(unit))
+            if len(unit) == 1:
+                return [self._resolve_title(*items[unit[0]])]
+            return self._rewrite_batch([items[i] for i in unit])
+
+        def collect(unit: List[int], resolved: List[Tuple[str, str]]) -> None:
+            for i, (new_t, source) in zip(unit, resolved):
+                results[i] = new_t
+                if on_result:
+                    on_result(i, new_t, source)
+
+        if self.config.concurrency <= 1 or len(units) <= 1:
+            for unit in units:
+                collect(unit, run_unit(unit))
+            return results
+
+        executor = self._get_executor()
+        futures = {executor.submit(run_unit, unit): unit for unit in units}
+        for future in as_completed(futures):
+            collect(futures[future], future.result())
+
+        return results
+
+    def _candidate_mask(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Select the rows whose SEO Title needs rewriting; see candidate_mask().
+        
+        Args:
+            df: Shopify product rows
+            
+        Returns:
+            Boolean Series aligned with df
+        """
+        return candidate_mask(df["Status"], df["SEO Title"], self.config.max_title_length)
+
+    def validate_csv(self, file_path: CsvSource) -> Tuple[bool, str]:
+        """
+        Validate that the CSV file has the required columns.
         
+        Only the header record is read, so this is cheap even for huge files.
+        
+        Args:
+            file_path: Path to the CSV file, or an open stream
+            
+        Returns:
+            Tuple of (is_valid, error_message)
+        """
+        return validate_header(file_path)
+
+    def _read_frames(self, stream: IO[str], columns: List[str]) -> Iterator[pd.DataFrame]:
+        """
+        Parse the data rows of an open CSV stream whose header was already read.
+        
+        Args:
+            stream: Text stream positioned at the first data row
+            columns: Column names from the header
+            
+        Returns:
+            Iterator of frames: one per chunk when Config.chunk_size is set,
+            otherwise a single frame with every row
+        """
+        read_options = {"dtype": str, "header": None, "names": columns}
         try:
-            # Validate input file
-            is_valid, error_msg = self.validate_csv(input_file)
-            if not is_valid:
-                return ProcessingResult(
-                    output_file="",
-                    total_products=0,
-                    active_products=0,
-                    edited_titles=0,
-                    processing_time=0,
-                    success=False,
-                    error_message=error_msg
-                )
+            if self.config.chunk_size > 0:
+                yield from pd.read_csv(stream, chunksize=self.config.chunk_size, **read_options)
+            else:
+                yield pd.read_csv(stream, **read_options)
+        except pd.errors.EmptyDataError:
+            # Header-only file
+            yield pd.DataFrame(columns=columns, dtype=str)
+
+    def _read_projected_frames(
+        self,
+        stream: IO[str],
+        columns: List[str]
+    ) -> Iterator[Tuple[pd.DataFrame, List[str]]]:
+        """
+        Split the data rows into raw records and parse only the working columns.
+        
+        Args:
+            stream: Text stream positioned at the first data row
+            columns: Column names from the header
             
-            # Read CSV
-            df = pd.read_csv(input_file, dtype=str)
-            total_products = len(df)
+        Returns:
+            Iterator of (frame, records) pairs, one per chunk when
+            Config.chunk_size is set. The frame holds the working columns of
+            the non-blank records; records holds every raw record, blank
+            lines included, exactly as read.
+        """
+        working = [col for col in PROJECTED_COLUMNS if col in columns]
+        positions = [columns.index(col) for col in working]
+        chunk_size = self.config.chunk_size if self.config.chunk_size > 0 else None
+        start = 0
+
+        def build(records: List[str]) -> pd.DataFrame:
+            data_records = [r for r in records if r.strip("\r\n")]
+            values: Dict[str, List[Optional[str]]] = {col: [] for col in working}
+            for fields in csv.reader(data_records):
+                for col, pos in zip(working, positions):
+                    # Blank fields are missing values, as pandas reads them
+                    values[col].append(fields[pos] or None if pos < len(fields) else None)
+            index = pd.RangeIndex(start, start + len(data_records))
+            return pd.DataFrame(values, index=index, dtype=object)
+
+        records: List[str] = []
+        for record in iter_raw_records(stream):
+            records.append(record)
+            if chunk_size and len(records) >= chunk_size:
+                frame = build(records)
+                yield frame, records
+                start += len(frame)
+                records = []
+        if records or start == 0:
+            yield build(records), records
+
+    def _write_changes(self, out: IO[str], df: pd.DataFrame, written: set) -> None:
+        """
+        Write one "Handle,SEO Title" row per product whose title changed.
+        
+        Args:
+            out: Output text stream
+            df: Processed frame with an "Edited Title" column
+            written: Handles already written by earlier chunks; updated in place
+        """
+        edited = df["Edited Title"]
+        changed = (edited.notna() & (edited != df["SEO Title"])).fillna(False).astype(bool)
+        for handle, title in zip(df.loc[changed, "Handle"], edited[changed]):
+            if pd.isna(handle) or handle in written:
+                continue
+            written.add(handle)
+            out.write(f"{quote_field(str(handle))},{quote_field(str(title))}\n")
+
+    def _write_passthrough(self, out: IO[str], records: List[str], edited: pd.Series) -> None:
+        """
+        Write raw records with their "Edited Title" value appended.
+        
+        Args:
+            out: Output text stream
+            records: Raw records of one chunk, blank lines included
+            edited: Edited titles for the chunk's non-blank records, in order
+        """
+        titles = iter(edited)
+        for record in records:
+            body, terminator = split_terminator(record)
+            if not body:
+                out.write(record)
+                continue
+            title = next(titles)
+            value = None if pd.isna(title) else str(title)
+            out.write(f"{body},{quote_field(value)}{terminator}")
+
+    def _failed_result(self, error_message: str, processing_time: float = 0) -> ProcessingResult:
+        """Build the ProcessingResult returned when processing fails."""
+        return ProcessingResult(
+            output_file="",
+            total_products=0,
+            active_products=0,
+            edited_titles=0,
+            processing_time=processing_time,
+            success=False,
+            error_message=error_message
+        )
+
+    def _process_frame(
+        self,
+        df: pd.DataFrame,
+        tracker: ProgressTracker,
+        memo: Dict[Tuple[str, str], str],
+        active_offset: int = 0,
+        first: bool = True,
+        journal: Optional[CheckpointJournal] = None,
+        previous: Optional[Dict[str, str]] = None
+    ) -> int:
+        """
+        Rewrite the candidate titles of one frame and add its "Edited Title" column.
+        
+        Args:
+            df: Shopify product rows (the whole file, or one chunk of it)
+            tracker: Progress tracker for the job
+            memo: Rewrites completed earlier in the job, keyed by normalised
+                (title, description); updated in place
+            active_offset: Active/draft rows seen in earlier chunks
+            first: Whether this is the first frame of the job
+            journal: Checkpoint journal that records each completed rewrite
+            previous: Edited titles of a previous run indexed by content_key();
+                see delta.load_previous(). Unchanged candidates reuse a prior
+                title that fits max_title_length.
             
-            # Generate output filename if not provided
-            if output_file is None:
-                base_name = os.path.splitext(os.path.basename(input_file))[0]
-                output_file = os.path.join(
-                    self.config.temp_dir,
-                    f"{base_name}_optimized_{int(time.time())}.csv"
+        Returns:
+            Active/draft rows seen up to and including this frame
+        """
+        # Filter only active/draft products for progress tracking
+        active_mask = df["Status"].str.strip().str.lower().isin(["active", "draft"])
+        # Cumulative active count per row, so progress lookups are O(1)
+        active_position = active_mask.cumsum() + active_offset
+        frame_active = int(active_mask.sum())
+
+        candidate_mask = self._candidate_mask(df)
+        candidate_df = df.loc[candidate_mask, ["SEO Title", "SEO Description"]]
+        candidates = list(candidate_df.index)
+        originals = df["SEO Title"]
+
+        # Delta mode: candidates unchanged since the previous export keep the
+        # title it gave them, and only new or changed rows reach the model
+        carried: Dict[Any, str] = {}
+        if previous:
+            handles = df["Handle"] if "Handle" in df.columns else pd.Series(None, index=df.index, dtype=object)
+            for idx, handle, title, desc in zip(
+                candidates, handles.loc[candidates], candidate_df["SEO Title"], candidate_df["SEO Description"]
+            ):
+                key = content_key(
+                    None if pd.isna(handle) else str(handle),
+                    str(title),
+                    None if pd.isna(desc) else str(desc)
                 )
-            
-            # Filter only active/draft products for progress tracking
-            active_mask = df["Status"].str.strip().str.lower().isin(["active", "draft"])
-            total_active = active_mask.sum()
-            edited_count = 0
+                prior = previous.get(key)
+                # Anything else (including a prior title that no longer fits) is rewritten
+                if prior is not None and len(prior) <= self.config.max_title_length:
+                    carried[idx] = prior
+            tracker.rows_carried(len(carried), sum(1 for idx, t in carried.items() if t != originals.at[idx]))
 
-            print(f"🚀 Total products: {total_products}")
-            print(f"🚀 Total active/draft products to process: {total_active}")
+        # Rows with the same (SEO Title, SEO Description) pair - typically the
+        # variant and image rows of one Handle - share a single rewrite
+        groups: Dict[Tuple[str, str], List[Any]] = {}
+        first_items: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        for idx, title, desc in zip(candidates, candidate_df["SEO Title"], candidate_df["SEO Description"]):
+            if idx in carried:
+                continue
+            title, desc = str(title), str(desc)
+            key = (" ".join(title.split()), " ".join(desc.split()))
+            if key not in groups:
+                groups[key] = []
+                first_items[key] = (title, desc)
+            groups[key].append(idx)
 
-            def process_row(row):
-                nonlocal edited_count
+        new_titles: Dict[Any, str] = dict(carried)
 
-                status = str(row.get("Status", "")).strip().lower()
-                title = row.get("SEO Title", "")
-                desc = row.get("SEO Description", "")
+        # Groups already rewritten in an earlier chunk reuse that title
+        for key in [key for key in groups if key in memo]:
+            rows = groups.pop(key)
+            for idx in rows:
+                new_titles[idx] = memo[key]
+            tracker.rows_reused(sum(1 for idx in rows if memo[key] != originals.at[idx]))
 
-                # Only process active titles, skip others
-                if status not in ("active") or pd.isna(title) or str(title).strip() == "":
-                    return title
+        keys = list(groups)
+        items = [first_items[key] for key in keys]
 
-                # Skip if already short enough
-                if len(str(title)) <= self.config.max_title_length:
-                    return title
+        tracker.add_work(
+            products=len(df),
+            active=frame_active,
+            candidate_rows=len(candidates),
+            rewrites=len(keys)
+        )
+        if first:
+            tracker.start()
+        else:
+            tracker.chunk_read()
 
-                # Rewrite title
-                new_t = self._rewrite_title(str(title), str(desc))
-                if new_t != title:
-                    edited_count += 1
+        def on_result(i: int, new_t: str, source: str) -> None:
+            rows = groups[keys[i]]
+            tracker.rewrite_done(
+                original_title=items[i][0],
+                new_title=new_t,
+                source=source,
+                rows=len(rows),
+                edited_rows=sum(1 for idx in rows if new_t != originals.at[idx]),
+                active_position=int(active_position.at[rows[-1]]),
+                from_model=source != SOURCE_CACHE
+            )
+            # Fallbacks are not checkpointed, so a resumed run asks the model again
+            if journal is not None and source != SOURCE_FALLBACK:
+                journal.record(keys[i], new_t)
+
+        rewrites = self._rewrite_titles(items, on_result, tracker.unit_started)
 
-                # Progress update
-                active_processed_so_far = active_mask[:row.name+1].sum()
-                remaining_active = total_active - active_processed_so_far
-                elapsed = time.time() - start_time
-                print(f"[Active {active_processed_so_far}/{total_active}] Edited: {edited_count} | "
-                      f"Remaining: {remaining_active} | Elapsed: {elapsed:.1f}s")
-                print(f"Orig({len(title)}): {title}\n -> New({len(new_t)}): {new_t}\n")
+        for key, new_t in zip(keys, rewrites):
+            memo[key] = new_t
+            for idx in groups[key]:
+                new_titles[idx] = new_t
 
-                return new_t
+        # Non-candidates keep their SEO Title; each rewrite fans out to its group's rows
+        edited = originals.astype(object)
+        if candidates:
+            edited.loc[candidates] = [new_titles[idx] for idx in candidates]
+        df["Edited Title"] = edited
 
-            df["Edited Title"] = df.apply(process_row, axis=1)
-            df.to_csv(output_file, index=False)
+        return active_offset + frame_active
+
+    def process_csv(
+        self,
+        input_file: CsvSource,
+        output_file: Optional[str] = None,
+        progress_callback: Optional[ProgressCallback] = print_progress,
+        resume: bool = False,
+        since: Optional[CsvSource] = None
+    ) -> ProcessingResult:
+        """
+        Process a Shopify CSV file to optimize product titles.
+        
+        Args:
+            input_file: Path to input CSV file, or an open text/binary stream
+                (e.g. an uploaded file), which is read exactly once. gzip and
+                zstd input is decompressed on the fly.
+            output_file: Path to output CSV file. If None, generates automatically.
+                A .gz or .zst name compresses the output; otherwise
+                Config.output_compression applies.
+            progress_callback: Receives a ProgressEvent when processing starts,
+                after every rewrite and when it finishes. Defaults to printing
+                a console report; pass None to stay silent.
+            resume: Reload the checkpoint journal left by an interrupted run
+                on the same file and settings, and skip the rewrites it holds.
+                Journaling needs a file path; streams are not checkpointed.
+            since: Optimized output of a previous run to diff against. Rows
+                whose Handle, SEO Title and SEO Description are unchanged
+                reuse its "Edited Title", so only new or changed products are
+                sent to the model.
+            
+        Returns:
+            ProcessingResult object with processing statistics. Model warm-up
+            time is reported separately from processing_time.
+        """
+        warmup_time = 0.0
+        if self.config.warm_up and not self._warmed_up:
+            warmup_time = self.warm_up()
+
+        start_time = time.time()
+        tracker = ProgressTracker(progress_callback, start_time)
+        journal: Optional[CheckpointJournal] = None
+        # Keep temp cleanup away from the input and output until the run ends
+        input_path = input_file if isinstance(input_file, str) else None
+        hold_files([input_path], touch=False)
+        held_output: Optional[str] = None
+        
+        try:
+            previous = None
+            if since is not None:
+                previous = load_previous(since)
+                print(f"♻️ Delta mode: {len(previous)} edited rows indexed from previous run")
+            
+            # The PyArrow reader needs bytes; passthrough copies text records verbatim,
+            # and the changes-only output needs no more than the projected columns
+            changes_only = self.config.output_mode == "changes"
+            use_arrow = (
+                self.config.csv_engine == "pyarrow"
+                and not self.config.passthrough
+                and not changes_only
+                and not isinstance(input_file, io.TextIOBase)
+            )
+            if use_arrow:
+                arrow_io.require_pyarrow()
+            copy_raw = self.config.passthrough and not changes_only
+
+            # Open the input once: validate the header, then parse the rest from the same stream
+            if use_arrow:
+                stream, release = open_binary(input_file)
+            else:
+                stream, release = open_text(input_file, keep_bom=copy_raw)
+            try:
+                raw_header = None
+                try:
+                    if use_arrow:
+                        columns = read_header_binary(stream)
+                    elif copy_raw:
+                        # Keep the header record (and any BOM) as read so it can be copied verbatim
+                        columns, raw_header = read_raw_header(stream)
+                    else:
+                        columns = read_header(stream)
+                except Exception as e:
+                    return self._failed_result(f"Error reading CSV file: {str(e)}")
+                is_valid, error_msg = check_columns(columns)
+                if not is_valid:
+                    return self._failed_result(error_msg)
+                if changes_only and "Handle" not in columns:
+                    return self._failed_result("Output mode 'changes' requires a Handle column")
+                
+                # Generate output filename if not provided
+                if output_file is None:
+                    source_name = str(input_file if isinstance(input_file, str) else getattr(input_file, "name", ""))
+                    if compression_for_path(source_name):
+                        source_name = os.path.splitext(source_name)[0]
+                    base_name = os.path.splitext(os.path.basename(source_name))[0] or "products"
+                    suffix = SUFFIXES.get(self.config.output_compression, "")
+                    output_file = os.path.join(
+                        self.config.temp_dir,
+                        f"{base_name}_optimized_{int(time.time())}.csv{suffix}"
+                    )
+                # An explicit .gz/.zst output name wins over Config.output_compression
+                compression = compression_for_path(output_file) or self.config.output_compression or None
+                # Unless streaming, the output is only written at the end
+                hold_files([output_file])
+                held_output = output_file
+                
+                # Every completed rewrite is appended to a journal keyed by the
+                # input file's hash, so an interrupted run can be resumed
+                if isinstance(input_file, str):
+                    journal = open_journal(
+                        self.config.temp_dir,
+                        input_file,
+                        json.dumps([self.config.model_name, self.config.max_title_length, self.prompt_fingerprint]),
+                        self.config.checkpoint_interval,
+                        resume
+                    )
+                
+                # Rewrites completed so far, shared across chunks so rows of one
+                # product that straddle a chunk boundary get the same title
+                memo: Dict[Tuple[str, str], str] = dict(journal.entries) if journal else {}
+                resumed_rewrites = len(memo)
+                if resumed_rewrites:
+                    print(f"♻️ Resuming: {resumed_rewrites} rewrites loaded from checkpoint")
+                active_offset = 0
+                columns = normalize_columns(columns)
+
+                if changes_only:
+                    # Minimal Shopify update file: Handle plus the new SEO Title
+                    with open_output(output_file, compression) as out:
+                        out.write("Handle,SEO Title\n")
+                        written: set = set()
+                        for chunk_number, (df, _) in enumerate(self._read_projected_frames(stream, columns)):
+                            active_offset = self._process_frame(df, tracker, memo, active_offset, chunk_number == 0, journal, previous)
+                            self._write_changes(out, df, written)
+                elif use_arrow:
+                    # Multithreaded parse into Arrow-backed string columns
+                    with open_output(output_file, compression, binary=True) as out:
+                        frames = arrow_io.read_frames(stream, columns, self.config.chunk_size)
+                        for chunk_number, df in enumerate(frames):
+                            active_offset = self._process_frame(df, tracker, memo, active_offset, chunk_number == 0, journal, previous)
+                            arrow_io.write_frame(out, df, include_header=chunk_number == 0)
+                else:
+                    with open_output(output_file, compression) as out:
+                        if self.config.passthrough:
+                            # Only the working columns are parsed; every other byte is copied
+                            body, terminator = split_terminator(raw_header)
+                            out.write(f"{body},{quote_field('Edited Title')}{terminator}")
+                            for chunk_number, (df, records) in enumerate(self._read_projected_frames(stream, columns)):
+                                active_offset = self._process_frame(df, tracker, memo, active_offset, chunk_number == 0, journal, previous)
+                                self._write_passthrough(out, records, df["Edited Title"])
+                        else:
+                            # Read CSV, in fixed-size chunks when streaming so memory stays bounded
+                            for chunk_number, df in enumerate(self._read_frames(stream, columns)):
+                                active_offset = self._process_frame(df, tracker, memo, active_offset, chunk_number == 0, journal, previous)
+                                df.to_csv(out, header=chunk_number == 0, index=False)
+            finally:
+                release()
+            tracker.finish()
+            if journal is not None:
+                # The output is complete, so the checkpoint is no longer needed
+                journal.discard()
 
             processing_time = time.time() - start_time
             
             return ProcessingResult(
                 output_file=output_file,
-                total_products=total_products,
-                active_products=total_active,
-                edited_titles=edited_count,
+                total_products=tracker.total_products,
+                active_products=tracker.total_active,
+                edited_titles=tracker.edited,
                 processing_time=processing_time,
-                success=True
+                success=True,
+                warmup_time=warmup_time,
+                cache_hits=tracker.cache_hits,
+                failed_rewrites=tracker.failed,
+                rewrite_candidates=tracker.candidate_rows,
+                rewrite_groups=tracker.total_rewrites,
+                resumed_rewrites=resumed_rewrites,
+                unchanged_rows=tracker.carried
             )
 
         except Exception as e:
-            processing_time = time.time() - start_time
-            return ProcessingResult(
-                output_file="",
-                total_products=0,
-                active_products=0,
-                edited_titles=0,
-                processing_time=processing_time,
-                success=False,
-                error_message=str(e)
-            )
+            return self._failed_result(str(e), time.time() - start_time)
+        finally:
+            if journal is not None:
+                journal.close()
+            release_files([held_output])
+            release_files([input_path], touch=False)
+
+    def process_many(
+        self,
+        input_files: List[str],
+        output_dir: Optional[str] = None,
+        progress_callback: Optional[Callable[[str, ProgressEvent], None]] = None,
+        max_parallel_files: Optional[int] = None,
+        resume: bool = False
+    ) -> Dict[str, ProcessingResult]:
+        """
+        Process several Shopify CSV files with this processor's shared resources.
+        
+        Files run side by side and share the backend, rewrite cache, circuit
+        breaker and worker pool, so their model requests interleave while
+        never exceeding Config.concurrency in flight.
+        
+        Args:
+            input_files: Paths of the CSV files to process
+            output_dir: Directory for the outputs, named
+                <input>_optimized.csv. If None, they go to Config.temp_dir
+                as <input>_optimized_<timestamp>.csv. Inputs that would
+                share an output name (e.g. b.csv and b.csv.gz) get a numeric
+                suffix ("_2", "_3", ...) in input order.
+            progress_callback: Receives (input_file, ProgressEvent) for every
+                event of every file. None stays silent.
+            max_parallel_files: Files processed at once (default:
+                Config.concurrency)
+            resume: Passed to process_csv() for each file
+            
+        Returns:
+            Dict mapping each input file to its ProcessingResult, in input order
+        """
+        if self.config.warm_up and not self._warmed_up:
+            self.warm_up()
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+
+        # Name every output up front, so files that run side by side never
+        # write the same path
+        directory = output_dir or self.config.temp_dir
+        stamp = "" if output_dir else f"_{int(time.time())}"
+        suffix = SUFFIXES.get(self.config.output_compression, "")
+        output_files: List[str] = []
+        taken: set = set()
+        for input_file in input_files:
+            name = os.path.basename(input_file)
+            if compression_for_path(name):
+                name = os.path.splitext(name)[0]
+            stem = f"{os.path.splitext(name)[0] or 'products'}_optimized{stamp}"
+            candidate = f"{stem}.csv{suffix}"
+            number = 1
+            # Compare case-insensitively for case-insensitive file systems
+            while candidate.lower() in taken:
+                number += 1
+                candidate = f"{stem}_{number}.csv{suffix}"
+            taken.add(candidate.lower())
+            output_files.append(os.path.join(directory, candidate))
+
+        def run(input_file: str, output_file: str) -> ProcessingResult:
+            callback = None
+            if progress_callback is not None:
+                callback = lambda event: progress_callback(input_file, event)
+            return self.process_csv(input_file, output_file, progress_callback=callback, resume=resume)
+
+        workers = max(1, max_parallel_files or self.config.concurrency)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="shopify-seo-file") as files:
+            results = list(files.map(run, input_files, output_files))
+        return dict(zip(input_files, results))
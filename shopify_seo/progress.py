@@ -0,0 +1,194 @@
+"""
+Progress reporting for Shopify SEO processing.
+"""
+
+import time
+import threading
+from dataclasses import dataclass
+from typing import Optional, Callable
+
+
+@dataclass
+class ProgressEvent:
+    """Snapshot of a processing job, published to progress callbacks."""
+
+    event: str  # "started", "chunk", "rewrite" or "finished"
+    total_products: int
+    total_active: int
+    candidate_rows: int
+    total_rewrites: int
+    completed: int
+    edited: int
+    in_flight: int
+    elapsed: float
+    rate: float  # Completed rewrites per second
+    eta: Optional[float]  # Seconds remaining, None until a rate is known
+    active_position: int = 0  # Active/draft rows up to and including the last rewritten row
+    original_title: Optional[str] = None
+    new_title: Optional[str] = None
+    source: Optional[str] = None
+    rows: int = 0  # Rows sharing the last rewrite
+
+    def to_dict(self) -> dict:
+        """Return the event as a JSON-serialisable dict."""
+        return dict(self.__dict__)
+
+
+ProgressCallback = Callable[[ProgressEvent], None]
+
+
+class ProgressTracker:
+    """
+    Thread-safe O(1) progress counters for one processing job.
+
+    Work is registered with add_work() (possibly several times, e.g. once per
+    chunk), and every state change publishes a ProgressEvent to the callback.
+    """
+
+    def __init__(self, callback: Optional[ProgressCallback] = None, start_time: Optional[float] = None):
+        """
+        Initialize the tracker.
+
+        Args:
+            callback: Receives every ProgressEvent; None discards them
+            start_time: Job start as returned by time.time(). Defaults to now.
+        """
+        self.callback = callback
+        self.start_time = start_time if start_time is not None else time.time()
+        self._lock = threading.Lock()
+
+        self.total_products = 0
+        self.total_active = 0
+        self.candidate_rows = 0
+        self.total_rewrites = 0
+        self.completed = 0
+        self.edited = 0
+        self.in_flight = 0
+        self.cache_hits = 0
+        self.failed = 0
+        self.carried = 0
+        self.active_position = 0
+
+    def add_work(self, products: int = 0, active: int = 0, candidate_rows: int = 0, rewrites: int = 0) -> None:
+        """Register more rows and rewrites to be processed."""
+        with self._lock:
+            self.total_products += products
+            self.total_active += active
+            self.candidate_rows += candidate_rows
+            self.total_rewrites += rewrites
+
+    def unit_started(self, count: int) -> None:
+        """Record that count rewrites were sent to the model (callable from any thread)."""
+        with self._lock:
+            self.in_flight += count
+
+    def start(self) -> None:
+        """Publish a "started" event with the registered totals."""
+        self._publish("started")
+
+    def chunk_read(self) -> None:
+        """Publish a "chunk" event after more work was registered mid-job."""
+        self._publish("chunk")
+
+    def rows_reused(self, edited_rows: int) -> None:
+        """Count rows that took a title rewritten earlier in the job."""
+        with self._lock:
+            self.edited += edited_rows
+
+    def rows_carried(self, rows: int, edited_rows: int) -> None:
+        """Count rows that kept their title from a previous export (delta mode)."""
+        with self._lock:
+            self.carried += rows
+            self.edited += edited_rows
+
+    def rewrite_done(
+        self,
+        original_title: str,
+        new_title: str,
+        source: str,
+        rows: int,
+        edited_rows: int,
+        active_position: int,
+        from_model: bool
+    ) -> None:
+        """
+        Record a completed rewrite and publish a "rewrite" event.
+
+        Args:
+            original_title: Title that was rewritten
+            new_title: Resulting title
+            source: Where the title came from ("cache", "model", "fallback", ...)
+            rows: Number of rows the rewrite applies to
+            edited_rows: How many of those rows actually changed
+            active_position: Cumulative active/draft row count at the last row
+            from_model: Whether the rewrite was counted by unit_started()
+        """
+        with self._lock:
+            self.completed += 1
+            self.edited += edited_rows
+            if from_model:
+                self.in_flight = max(0, self.in_flight - 1)
+            if source == "cache":
+                self.cache_hits += 1
+            elif source == "fallback":
+                self.failed += 1
+            self.active_position = max(self.active_position, active_position)
+        self._publish(
+            "rewrite",
+            original_title=original_title,
+            new_title=new_title,
+            source=source,
+            rows=rows
+        )
+
+    def finish(self) -> None:
+        """Publish a "finished" event."""
+        self._publish("finished")
+
+    def snapshot(self, event: str = "progress", **details) -> ProgressEvent:
+        """Build a ProgressEvent from the current counters."""
+        with self._lock:
+            elapsed = max(0.0, time.time() - self.start_time)
+            rate = self.completed / elapsed if elapsed > 0 else 0.0
+            remaining = max(0, self.total_rewrites - self.completed)
+            eta = remaining / rate if rate > 0 else None
+            return ProgressEvent(
+                event=event,
+                total_products=self.total_products,
+                total_active=self.total_active,
+                candidate_rows=self.candidate_rows,
+                total_rewrites=self.total_rewrites,
+                completed=self.completed,
+                edited=self.edited,
+                in_flight=self.in_flight,
+                elapsed=elapsed,
+                rate=rate,
+                eta=eta,
+                active_position=self.active_position,
+                **details
+            )
+
+    def _publish(self, event: str, **details) -> None:
+        if self.callback is not None:
+            self.callback(self.snapshot(event, **details))
+
+
+def print_progress(event: ProgressEvent) -> None:
+    """Default progress callback: print a console report like the CLI always has."""
+    if event.event == "started":
+        print(f"🚀 Total products: {event.total_products}")
+        print(f"🚀 Total active/draft products to process: {event.total_active}")
+        print(f"🚀 Titles to rewrite: {event.candidate_rows} rows in {event.total_rewrites} unique groups")
+    elif event.event == "chunk":
+        print(f"📦 Read so far: {event.total_products} products, {event.total_active} active/draft, "
+              f"{event.total_rewrites} unique titles to rewrite")
+    elif event.event == "rewrite":
+        remaining_active = event.total_active - event.active_position
+        eta = f"{event.eta:.0f}s" if event.eta is not None else "?"
+        print(f"[Active {event.active_position}/{event.total_active}] Edited: {event.edited} | "
+              f"Remaining: {remaining_active} | Elapsed: {event.elapsed:.1f}s | "
+              f"Rewrites: {event.completed}/{event.total_rewrites} @ {event.rate:.2f}/s | ETA: {eta}")
+        title = event.original_title or ""
+        new_t = event.new_title or ""
+        print(f"Orig({len(title)}): {title}\n -> New({len(new_t)}): {new_t}"
+              f"{f' (x{event.rows} rows)' if event.rows > 1 else ''}\n")
@@ -0,0 +1,152 @@
+"""
+Retry and circuit breaker helpers for model requests.
+"""
+
+import time
+import random
+import threading
+from typing import Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a call is rejected because the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker.
+
+    After failure_threshold consecutive failures the circuit opens and
+    calls are rejected immediately. Once reset_timeout seconds have passed
+    the circuit is half-open: the next call is let through as a probe, and
+    its outcome closes or re-opens the circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures before the circuit opens
+            reset_timeout: Seconds to wait before probing an open circuit
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        """Current state of the circuit."""
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def before_call(self) -> None:
+        """
+        Check whether a call may proceed.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with a
+                probe already in flight
+        """
+        with self._lock:
+            state = self._state()
+            if state == self.CLOSED:
+                return
+            if state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+            raise CircuitOpenError("Circuit breaker is open; skipping model call")
+
+    def record_success(self) -> None:
+        """Record a successful call and close the circuit."""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the circuit if the threshold is reached."""
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+
+def backoff_delay(attempt: int, base: float, maximum: float) -> float:
+    """
+    Exponential backoff delay with jitter.
+
+    Args:
+        attempt: Zero-based retry attempt number
+        base: Delay before the first retry
+        maximum: Upper bound on the delay
+
+    Returns:
+        Delay in seconds, between half and all of the capped exponential value
+    """
+    delay = min(maximum, base * (2 ** attempt))
+    return delay * random.uniform(0.5, 1.0)
+
+
+def call_with_retries(
+    func: Callable[[], T],
+    max_retries: int,
+    backoff: float,
+    backoff_max: float,
+    breaker: Optional[CircuitBreaker] = None,
+    is_retryable: Callable[[Exception], bool] = lambda e: True,
+    sleep: Callable[[float], None] = time.sleep
+) -> T:
+    """
+    Call func, retrying failures with exponential backoff.
+
+    Args:
+        func: Zero-argument callable to invoke
+        max_retries: Number of retries after the first attempt
+        backoff: Delay before the first retry in seconds
+        backoff_max: Upper bound on any single delay in seconds
+        breaker: Optional circuit breaker consulted before every attempt
+        is_retryable: Predicate deciding whether an exception is worth retrying
+        sleep: Sleep function (overridable for testing)
+
+    Returns:
+        The return value of func
+
+    Raises:
+        CircuitOpenError: If the breaker rejects an attempt
+        Exception: The last error raised by func once retries are exhausted
+    """
+    attempt = 0
+    while True:
+        if breaker is not None:
+            breaker.before_call()
+        try:
+            result = func()
+        except Exception as e:
+            if breaker is not None:
+                breaker.record_failure()
+            if attempt >= max_retries or not is_retryable(e):
+                raise
+            sleep(backoff_delay(attempt, backoff, backoff_max))
+            attempt += 1
+            continue
+        if breaker is not None:
+            breaker.record_success()
+        return result
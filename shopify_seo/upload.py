@@ -0,0 +1,228 @@
+"""
+Streaming upload handling for the web app.
+
+Uploads are inspected as they arrive: the header is validated and the
+rewrite candidates are counted before the body has finished uploading,
+and the bytes are kept in memory only up to a threshold before spilling
+to a file in the temp directory.
+"""
+
+import io
+import os
+import csv
+import uuid
+import codecs
+import pandas as pd
+from typing import List, Optional
+
+from .compression import IncrementalDecompressor, compression_for_path, sniff
+from .csv_io import RecordSplitter, check_columns, normalize_columns
+from .processor import candidate_mask
+
+
+class UploadRejected(Exception):
+    """
+    Raised while an upload is streaming in when it cannot be processed.
+
+    Deliberately not a ValueError: the form parser silently drops files
+    whose stream raises ValueError.
+    """
+
+
+class UploadInspector:
+    """
+    Incrementally parses an uploaded CSV to validate it and count its rows.
+
+    Records are split by csv_io.RecordSplitter, as the processor's
+    passthrough reader does, so only complete records are ever parsed, and
+    candidates are counted with the processor's own candidate_mask().
+    """
+
+    def __init__(self, filename: str, max_title_length: int):
+        """
+        Args:
+            filename: Uploaded file name; a .gz or .zst suffix selects decompression
+            max_title_length: Titles longer than this are rewrite candidates
+        """
+        self.max_title_length = max_title_length
+        self.columns: Optional[List[str]] = None
+        self.rows = 0
+        self.candidate_rows = 0
+
+        self._compression = compression_for_path(filename)
+        self._decompressor: Optional[IncrementalDecompressor] = None
+        self._head = b""  # Bytes held back until compression can be sniffed
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._splitter = RecordSplitter()
+        self._status_index = 0
+        self._title_index = 0
+        # Status and SEO Title of rows not yet counted
+        self._statuses: List[str] = []
+        self._titles: List[str] = []
+
+    def feed(self, data: bytes) -> None:
+        """
+        Inspect the next piece of the upload.
+
+        Raises:
+            UploadRejected: If the header is invalid or the data cannot be
+                decompressed, decoded as UTF-8 or parsed
+        """
+        if self._decompressor is None and self._compression is None:
+            self._head += data
+            if len(self._head) < 4:
+                return
+            data, self._head = self._head, b""
+            self._compression = sniff(io.BytesIO(data)) or ""
+        if self._compression and self._decompressor is None:
+            try:
+                self._decompressor = IncrementalDecompressor(self._compression)
+            except ImportError as e:
+                raise UploadRejected(str(e))
+        if self._decompressor is not None:
+            try:
+                data = self._decompressor.decompress(data)
+            except Exception as e:
+                raise UploadRejected(f"Could not decompress upload: {e}")
+        self._add_records(self._splitter.feed(self._decode(data)))
+
+    def finish(self) -> None:
+        """
+        Inspect whatever is left once the upload is complete.
+
+        Raises:
+            UploadRejected: If the upload held no header, or its end cannot
+                be decoded or parsed
+        """
+        if self._head:
+            head, self._head = self._head, b""
+            self._compression = ""
+            self.feed(head)
+        records = self._splitter.feed(self._decode(b"", final=True))
+        self._add_records(records + self._splitter.finish())
+        if self.columns is None:
+            raise UploadRejected("No columns to parse from file")
+
+    def _decode(self, data: bytes, final: bool = False) -> str:
+        # Strict, like the processor's reader, so undecodable uploads are refused here
+        try:
+            return self._decoder.decode(data, final)
+        except UnicodeDecodeError as e:
+            raise UploadRejected(f"Upload is not UTF-8 encoded ({e.reason}); export the CSV as UTF-8")
+
+    def _add_records(self, records: List[str]) -> None:
+        for record in records:
+            self._add_record(record)
+        if self._titles:
+            statuses = pd.Series(self._statuses, dtype=object)
+            titles = pd.Series(self._titles, dtype=object)
+            self.candidate_rows += int(candidate_mask(statuses, titles, self.max_title_length).sum())
+            self._statuses, self._titles = [], []
+
+    def _add_record(self, record: str) -> None:
+        try:
+            fields = next(csv.reader(io.StringIO(record, newline="")), [])
+        except csv.Error as e:
+            raise UploadRejected(f"Could not parse CSV: {e}")
+        if not any(field.strip() for field in fields):
+            return  # Blank lines are skipped, as pandas does
+
+        if self.columns is None:
+            self.columns = normalize_columns(fields)
+            is_valid, error_message = check_columns(self.columns)
+            if not is_valid:
+                raise UploadRejected(error_message)
+            self._status_index = self.columns.index("Status")
+            self._title_index = self.columns.index("SEO Title")
+            return
+
+        self.rows += 1
+        self._statuses.append(fields[self._status_index] if self._status_index < len(fields) else "")
+        self._titles.append(fields[self._title_index] if self._title_index < len(fields) else "")
+
+
+class UploadSink:
+    """
+    Writable, readable upload container that inspects bytes as they arrive.
+
+    Data stays in memory until it exceeds spool_size, then moves to a file
+    in temp_dir (``path``) that the processing job reads directly.
+    """
+
+    def __init__(self, temp_dir: str, filename: str, max_title_length: int, spool_size: int):
+        """
+        Args:
+            temp_dir: Directory for uploads larger than spool_size
+            filename: Uploaded file name (already made safe for the file system)
+            max_title_length: Titles longer than this are rewrite candidates
+            spool_size: Bytes kept in memory before spilling to disk
+        """
+        self.temp_dir = temp_dir
+        self.filename = filename
+        self.spool_size = spool_size
+        self.inspector = UploadInspector(filename, max_title_length)
+        self.path: Optional[str] = None
+        self.size = 0
+        self._file: io.BufferedIOBase = io.BytesIO()
+
+    def write(self, data: bytes) -> int:
+        try:
+            self.inspector.feed(data)
+        except UploadRejected:
+            self.discard()
+            raise
+        if self.path is None and self.size + len(data) > self.spool_size:
+            self._spill()
+        self.size += len(data)
+        return self._file.write(data)
+
+    def _spill(self) -> None:
+        self.path = os.path.join(self.temp_dir, f"{uuid.uuid4()}_upload_{self.filename}")
+        spilled = open(self.path, "w+b")
+        spilled.write(self._file.getvalue())
+        self._file = spilled
+
+    def finish(self) -> None:
+        """
+        Complete the inspection once the upload has been received.
+
+        Raises:
+            UploadRejected: If the upload is not a valid Shopify export
+        """
+        try:
+            self.inspector.finish()
+        except UploadRejected:
+            self.discard()
+            raise
+
+    def getvalue(self) -> Optional[bytes]:
+        """Return the upload's bytes if it is still held in memory, otherwise None."""
+        return None if self.path else self._file.getvalue()
+
+    def discard(self) -> None:
+        """Close the container and delete its spilled file, if any."""
+        self.close()
+        if self.path:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+    def read(self, size: int = -1) -> bytes:
+        return self._file.read(size)
+
+    def readline(self, size: int = -1) -> bytes:
+        return self._file.readline(size)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        return self._file.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._file.tell()
+
+    def close(self) -> None:
+        self._file.close()
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
@@ -3,6 +3,8 @@ const fileInput = document.getElementById('fileInput');
 const processBtn = document.getElementById('processBtn');
 const progress = document.getElementById('progress');
 const progressFill = document.getElementById('progressFill');
+const progressText = document.getElementById('progressText');
+const recentRewrites = document.getElementById('recentRewrites');
 const status = document.getElementById('status');
 
 let selectedFile = null;
@@ -34,13 +36,13 @@ uploadArea.addEventListener('drop', (e) => {
 function handleFileSelect(event) {
     const file = event.target.files[0];
     if (file) {
-        if (file.type === 'text/csv' || file.name.endsWith('.csv')) {
+        if (file.type === 'text/csv' || /\.csv(\.gz|\.zst)?$/i.test(file.name)) {
             selectedFile = file;
             uploadArea.innerHTML = `
                 <div class="upload-icon">✅</div>
                 <div class="upload-text">${file.name}</div>
                 <div class="upload-subtext">Ready to process</div>
-                <input type="file" id="fileInput" accept=".csv" style="display: none;" />
+                <input type="file" id="fileInput" accept=".csv,.gz,.zst" style="display: none;" />
             `;
             processBtn.disabled = false;
         } else {
@@ -55,41 +57,83 @@ async function processFile() {
     processBtn.disabled = true;
     progress.style.display = 'block';
     progressFill.style.width = '10%';
+    progressText.textContent = 'Uploading...';
+    recentRewrites.replaceChildren();
     status.style.display = 'none';
     
     const formData = new FormData();
     formData.append('file', selectedFile);
     
     try {
-        progressFill.style.width = '30%';
-        
         const response = await fetch('/api/upload', {
             method: 'POST',
             body: formData
         });
         
-        progressFill.style.width = '70%';
-        
         const data = await response.json();
         
         if (response.ok) {
+            // The upload is queued; follow the job until it finishes
             currentJobId = data.job_id;
+            const job = await waitForJob(currentJobId);
             progressFill.style.width = '100%';
             
             setTimeout(() => {
-                showSuccess(data);
+                showSuccess(job);
             }, 500);
         } else {
             showStatus(data.error || 'Processing failed', 'error');
         }
     } catch (error) {
-        showStatus('Network error: ' + error.message, 'error');
+        showStatus('Error: ' + error.message, 'error');
     } finally {
         processBtn.disabled = false;
         progress.style.display = 'none';
     }
 }
 
+function waitForJob(jobId) {
+    // One long-lived event stream instead of polling /api/status
+    return new Promise((resolve, reject) => {
+        const events = new EventSource(`/api/jobs/${jobId}/events`);
+        events.addEventListener('progress', (e) => showProgress(JSON.parse(e.data)));
+        events.addEventListener('done', (e) => {
+            events.close();
+            resolve(JSON.parse(e.data));
+        });
+        events.addEventListener('failed', (e) => {
+            events.close();
+            reject(new Error(JSON.parse(e.data).error || 'Processing failed'));
+        });
+        events.onerror = () => {
+            // EventSource reconnects by itself unless the stream was refused
+            if (events.readyState === EventSource.CLOSED) {
+                reject(new Error('Lost connection to the server'));
+            }
+        };
+    });
+}
+
+function showProgress(job) {
+    const p = job.progress;
+    if (job.status === 'queued' || !p) {
+        const titles = job.candidate_rows === null ? '' : ` (${job.candidate_rows} titles to rewrite)`;
+        progressText.textContent = `Waiting for a free worker...${titles}`;
+        return;
+    }
+    if (p.total_rewrites) {
+        progressFill.style.width = `${Math.max(10, Math.round(100 * p.completed / p.total_rewrites))}%`;
+    }
+    const eta = p.eta === null ? '' : ` · about ${Math.ceil(p.eta)}s left`;
+    progressText.textContent =
+        `${p.completed}/${p.total_rewrites} titles rewritten · ${p.rate.toFixed(1)}/s${eta}`;
+    recentRewrites.replaceChildren(...job.recent_rewrites.slice(-3).reverse().map((r) => {
+        const line = document.createElement('div');
+        line.textContent = `${r.original_title} → ${r.new_title}`;
+        return line;
+    }));
+}
+
 function showSuccess(data) {
     const stats = data.stats;
     status.innerHTML = `
@@ -128,6 +172,17 @@ function showStatus(message, type) {
     status.style.display = 'block';
 }
 
+function downloadName(response) {
+    // Use the server's name: it matches what fetch hands back, which is the
+    // plain CSV when the response was sent with a Content-Encoding
+    const disposition = response.headers.get('Content-Disposition') || '';
+    const encoded = disposition.match(/filename\*=UTF-8''([^;]+)/i);
+    if (encoded) return decodeURIComponent(encoded[1]);
+    const plain = disposition.match(/filename="?([^";]+)"?/i);
+    if (plain) return plain[1];
+    return `optimized_${selectedFile.name.replace(/\.(gz|zst)$/i, '')}`;
+}
+
 async function downloadFile() {
     if (!currentJobId) return;
     
@@ -138,7 +193,7 @@ async function downloadFile() {
             const url = window.URL.createObjectURL(blob);
             const a = document.createElement('a');
             a.href = url;
-            a.download = `optimized_${selectedFile.name}`;
+            a.download = downloadName(response);
             document.body.appendChild(a);
             a.click();
             window.URL.revokeObjectURL(url);